@@ -0,0 +1,238 @@
+"""
+End to end scaffolding benchmark: creates an app for every combination of the prompt answers
+(auth, example, fonts, shadcn, bun or npm) with stand-in uv/bun/bunx/npm/npx/node executables
+(stubs/toolchain.py) on PATH, so no network is needed and the tool latency is under control.
+
+Each app runs the same step graph as `create-hyperpy-app <name>`, without prompts nor client cache.
+For every combination it reports the wall time of each step, the template parse and render times,
+and the files and bytes written, the best of --repeat runs (the stubs are python processes, single runs are noisy).
+
+    python benchmarks/bench_scaffold.py --latency "uv sync=0.3,bun install=0.5,*=0.05"
+    python benchmarks/bench_scaffold.py --save-baseline benchmarks/baselines/scaffold.json
+    python benchmarks/bench_scaffold.py --baseline benchmarks/baselines/scaffold.json --threshold 0.2
+
+With --baseline it exits with 1 when a timing grows over the threshold (and over --min-delta-ms,
+so stub noise doesn't count), or when the files written change.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import itertools
+import contextlib
+from dataclasses import replace
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs", "toolchain.py")
+STUB_TOOLS = ["uv", "bun", "bunx", "npm", "npx", "node"]
+MATRIX_OPTIONS = ["piccolo_auth", "piccolo_example", "sqlite_profiles", "fonts", "shadcn"]
+
+DEFAULT_LATENCY = "0.02"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 100
+DEFAULT_REPEAT = 3
+
+def make_stub_bin(bin_dir: str) -> str:
+    """Write an executable wrapper per tool that runs the stub with this interpreter."""
+    os.makedirs(bin_dir, exist_ok=True)
+    for tool in STUB_TOOLS:
+        path = os.path.join(bin_dir, tool)
+        with open(path, "w") as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{STUB}" {tool} "$@"\n')
+        os.chmod(path, 0o755)
+    return bin_dir
+
+
+def option_matrix(package_managers: list[str]) -> list[dict]:
+    """Every combination of the yes/no prompts, for each package manager."""
+    combos = []
+    for package_manager in package_managers:
+        for values in itertools.product([False, True], repeat=len(MATRIX_OPTIONS)):
+            combos.append({**dict(zip(MATRIX_OPTIONS, values)), "package_manager": package_manager})
+    return combos
+
+
+def combo_name(options: dict) -> str:
+    selected = [option for option in MATRIX_OPTIONS if options[option]]
+    return "+".join([options["package_manager"], *selected]) if selected else f"{options['package_manager']}+plain"
+
+
+def tree_size(path: str) -> tuple[int, int]:
+    """Number of files and bytes under path, links are not followed."""
+    files = size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            files += 1
+            size += os.lstat(os.path.join(root, name)).st_size
+    return files, size
+
+
+def timed(step, phases: dict):
+    """The step with its action wrapped to record its wall time in phases."""
+    async def action():
+        start = time.perf_counter()
+        try:
+            await step.action()
+        finally:
+            phases[step.name] = (time.perf_counter() - start) * 1000
+    return replace(step, action=action)
+
+
+def run_combo(options: dict, work_dir: str) -> dict:
+    """Scaffold one app and measure it, the console output is discarded."""
+    from hyperpytext.utils.bundle_utils import get_templates_path, load_yaml
+    from hyperpytext.utils.dag_utils import run_steps
+    from hyperpytext.utils.options_utils import MAX_CONCURRENCY, AppOptions
+    from hyperpytext.utils.scaffold_utils import app_steps, plan_app
+
+    app_options = AppOptions(**options)
+    app_dir = os.path.join(work_dir, combo_name(options).replace("+", "_"))
+    shutil.rmtree(app_dir, ignore_errors=True)
+
+    # Template costs: parsing the yaml the options select (what a bundle compile pays), then rendering them
+    start = time.perf_counter()
+    plans = plan_app(app_dir, app_options)
+    render_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for plan in plans:
+        for group in plan.groups:
+            load_yaml(get_templates_path() / f"{group.group}.yaml")
+    parse_ms = (time.perf_counter() - start) * 1000
+
+    phases = {}
+    steps = [timed(step, phases) for step in app_steps(app_dir, app_options, interactive=False, use_cache=False)]
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        asyncio.run(run_steps(steps, max_concurrency=MAX_CONCURRENCY))
+    total_ms = (time.perf_counter() - start) * 1000
+
+    files, size = tree_size(app_dir)
+    shutil.rmtree(app_dir, ignore_errors=True)
+    return {
+        "total_ms": total_ms,
+        "parse_ms": parse_ms,
+        "render_ms": render_ms,
+        "phases": phases,
+        "template_files": sum(len(plan.files) for plan in plans),
+        "template_bytes": sum(plan.size for plan in plans),
+        "files": files,
+        "bytes": size,
+    }
+
+
+def best_result(runs: list[dict]) -> dict:
+    """Best of every timing across the runs, the counts are the same on every run."""
+    result = dict(runs[-1])
+    for key in ("total_ms", "parse_ms", "render_ms"):
+        result[key] = min(run[key] for run in runs)
+    result["phases"] = {phase: min(run["phases"][phase] for run in runs) for phase in runs[-1]["phases"]}
+    return result
+
+
+def timings(result: dict) -> dict[str, float]:
+    return {"total": result["total_ms"], "parse": result["parse_ms"], "render": result["render_ms"], **result["phases"]}
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """Regressions of results against a baseline, as readable lines."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        base_timings = timings(base)
+        for metric, value in timings(result).items():
+            previous = base_timings.get(metric)
+            if previous is not None and value > previous * (1 + threshold) and value - previous > min_delta_ms:
+                regressions.append(f"{name} {metric}: {value:.0f}ms vs {previous:.0f}ms (+{(value / previous - 1) * 100:.0f}%)")
+        for metric in ("template_files", "template_bytes", "files", "bytes"):
+            if result[metric] != base[metric]:
+                regressions.append(f"{name} {metric}: {result[metric]} vs {base[metric]}")
+    return regressions
+
+
+def print_report(results: dict):
+    phases = sorted({phase for result in results.values() for phase in result["phases"]})
+    columns = ["combo", "total", "parse", "render", *phases, "files", "bytes"]
+    rows = []
+    for name, result in results.items():
+        row = [name, f"{result['total_ms']:.0f}", f"{result['parse_ms']:.1f}", f"{result['render_ms']:.1f}"]
+        row += [f"{result['phases'][phase]:.0f}" if phase in result["phases"] else "-" for phase in phases]
+        row += [str(result["files"]), str(result["bytes"])]
+        rows.append(row)
+    widths = [max(len(column), *(len(row[index]) for row in rows)) for index, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) if index == 0 else value.rjust(width) for index, (value, width) in enumerate(zip(row, widths))))
+    print("Times in ms, files and bytes of the whole app tree")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="Stub latency: seconds per command, or per command as 'uv sync=0.5,*=0.05'")
+    parser.add_argument("--package-manager", choices=["bun", "npm"], action="append", help="Only benchmark these package managers")
+    parser.add_argument("--only", action="append", default=[], help="Only the combos with these names (e.g. bun+piccolo_auth)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per combo, the best one is reported")
+    parser.add_argument("--output", help="Write the results to this json file")
+    parser.add_argument("--save-baseline", help="Write the results as the baseline to this json file")
+    parser.add_argument("--baseline", help="Compare against this baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown over the baseline, 0.25 is 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS, help="Smaller slowdowns are never regressions")
+    args = parser.parse_args()
+
+    combos = option_matrix(args.package_manager or ["bun", "npm"])
+    if args.only:
+        combos = [options for options in combos if combo_name(options) in args.only]
+
+    with tempfile.TemporaryDirectory(prefix="hyperpy-bench-") as work_dir:
+        os.environ["PATH"] = os.pathsep.join([make_stub_bin(os.path.join(work_dir, "bin")), os.environ.get("PATH", "")])
+        os.environ["HYPERPY_STUB_LATENCY"] = args.latency
+        os.environ["HYPERPY_CACHE_DIR"] = os.path.join(work_dir, "cache")
+
+        # The first template load compiles the bundle, once per templates version
+        from hyperpytext.utils.bundle_utils import get_bundle
+        start = time.perf_counter()
+        get_bundle()
+        bundle_ms = (time.perf_counter() - start) * 1000
+
+        results = {}
+        for options in combos:
+            name = combo_name(options)
+            results[name] = best_result([run_combo(options, work_dir) for _ in range(max(1, args.repeat))])
+            print(f"✔ {name}: {results[name]['total_ms']:.0f}ms", file=sys.stderr)
+
+    report = {
+        "meta": {"latency": args.latency, "repeat": args.repeat, "python": platform.python_version(), "bundle_compile_ms": bundle_ms},
+        "results": results,
+    }
+    print_report(results)
+    print(f"Template bundle compiled in {bundle_ms:.1f}ms")
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✔ Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("latency") != args.latency:
+            print(f"🚩 The baseline was measured with --latency {baseline.get('meta', {}).get('latency')}, timings are not comparable")
+            return 1
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"🚩 {len(regressions)} regressions over {args.threshold * 100:.0f}% against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"✔ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
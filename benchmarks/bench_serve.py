@@ -0,0 +1,111 @@
+"""
+Request latency of the serve daemon against a new create-hyperpy-app process per app, with the stand-in
+toolchain of bench_scaffold.py on PATH (no network, controlled tool latency).
+
+Both sides create the same apps with a warm client snapshot cache: the cold side runs `batch` with a
+single app spec per process (interpreter start, imports, template loading, tool probes every time),
+the daemon side posts the same apps to one `serve` process over a unix socket.
+
+    python benchmarks/bench_serve.py --apps 10 --latency 0
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_scaffold import make_stub_bin  # noqa: E402
+
+CLI = [sys.executable, "-c", "from hyperpytext import app; app()"]
+
+
+def post(socket_path: str, path: str, payload: dict) -> list[dict]:
+    """POST a json request to the daemon, returns the json lines of the response."""
+    body = json.dumps(payload).encode()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        response = b""
+        while chunk := client.recv(65536):
+            response += chunk
+    _, _, content = response.partition(b"\r\n\r\n")
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def wait_for_socket(socket_path: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(socket_path):
+            return
+        time.sleep(0.05)
+    raise TimeoutError(f"The daemon didn't listen on {socket_path}")
+
+
+def cold_run(work_dir: str, index: int, options: dict) -> float:
+    """One app from a new process, as a portal shelling out to the cli would."""
+    spec = os.path.join(work_dir, f"spec-{index}.json")
+    with open(spec, "w") as f:
+        json.dump({"apps": [{"app_name": f"cold{index}", **options}]}, f)
+    start = time.perf_counter()
+    subprocess.run([*CLI, "batch", spec, "-o", os.path.join(work_dir, "cold")], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def summary(times: list[float]) -> str:
+    times = sorted(times)
+    return f"p50 {statistics.median(times) * 1000:.0f}ms, max {times[-1] * 1000:.0f}ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=10, help="Apps created on each side")
+    parser.add_argument("--latency", default="0", help="Stub latency: seconds per command, or per command as 'uv sync=0.5,*=0.05'")
+    parser.add_argument("--package-manager", choices=["bun", "npm"], default="bun")
+    args = parser.parse_args()
+    options = {"package_manager": args.package_manager, "shadcn": True}
+
+    with tempfile.TemporaryDirectory(prefix="hyperpy-bench-") as work_dir:
+        os.environ["PATH"] = os.pathsep.join([make_stub_bin(os.path.join(work_dir, "bin")), os.environ.get("PATH", "")])
+        os.environ["HYPERPY_STUB_LATENCY"] = args.latency
+        os.environ["HYPERPY_CACHE_DIR"] = os.path.join(work_dir, "cache")
+
+        # Warm the client snapshot and the templates bundle for both sides
+        cold_run(work_dir, 0, options)
+        cold = [cold_run(work_dir, index, options) for index in range(1, args.apps + 1)]
+        print(f"✔ new process per app: {summary(cold)}", file=sys.stderr)
+
+        socket_path = os.path.join(work_dir, "serve.sock")
+        daemon = subprocess.Popen(
+            [*CLI, "serve", "--socket", socket_path, "-o", os.path.join(work_dir, "served")],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_socket(socket_path)
+            served = []
+            for index in range(args.apps):
+                start = time.perf_counter()
+                events = post(socket_path, "/scaffold", {"app_name": f"served{index}", **options})
+                served.append(time.perf_counter() - start)
+                if events[-1]["event"] != "done":
+                    print(f"🚩 served{index} failed: {events[-1]}")
+                    return 1
+            print(f"✔ serve daemon: {summary(served)}", file=sys.stderr)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"{'Mode':<24}{'p50':>10}{'max':>10}")
+    for name, times in (("new process per app", cold), ("serve daemon", served)):
+        print(f"{name:<24}{statistics.median(times) * 1000:>8.0f}ms{max(times) * 1000:>8.0f}ms")
+    print(f"Speedup at p50: {statistics.median(cold) / statistics.median(served):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Startup budget check for the cli: runs `create-hyperpy-app --help` under `python -X importtime`
+and fails when the imports take longer than the budget, or when a module that only the commands
+need (yaml, asyncio, the scaffold utils...) gets imported just to print the help.
+
+    python benchmarks/check_import_time.py --budget-ms 300
+"""
+import sys
+import argparse
+import subprocess
+
+HELP_SCRIPT = "from hyperpytext import app; app(['--help'], prog_name='create-hyperpy-app')"
+
+# Modules the help output must not import, they belong to the commands
+DEFERRED_MODULES = [
+    "yaml",
+    "asyncio",
+    "hyperpytext.utils.scaffold_utils",
+    "hyperpytext.utils.bundle_utils",
+    "hyperpytext.utils.uv_utils",
+    "rich.prompt",
+]
+
+DEFAULT_BUDGET_MS = 300
+DEFAULT_RUNS = 5
+
+def import_times(script: str = HELP_SCRIPT) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module imported while running the script."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = (int(cumulative), len(name) - len(name.lstrip()))
+    # Top level imports (the least indented ones) add up to the whole import time
+    top_level = min(indent for _, indent in times.values())
+    total = sum(cumulative for cumulative, indent in times.values() if indent == top_level)
+    return {"__total__": total, **{name: cumulative for name, (cumulative, _) in times.items()}}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum import time for --help")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="The best of these runs is checked, to skip cold caches")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(max(1, args.runs))]
+    best = min(runs, key=lambda times: times["__total__"])
+    total_ms = best["__total__"] / 1000
+
+    print(f"create-hyperpy-app --help imports: {total_ms:.1f}ms (budget {args.budget_ms:.0f}ms, best of {len(runs)})")
+    slowest = sorted(((name, us) for name, us in best.items() if name != "__total__"), key=lambda item: -item[1])
+    for name, us in slowest[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    failed = False
+    deferred = [name for name in DEFERRED_MODULES if name in best]
+    if deferred:
+        print(f"🚩 --help imports modules that only the commands need: {', '.join(deferred)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"🚩 --help startup is over budget: {total_ms:.1f}ms > {args.budget_ms:.0f}ms")
+        failed = True
+    if not failed:
+        print("✔ Startup within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Stand-in for the uv, bun, bunx, npm, npx and node executables, for benchmarks and offline runs.
+It answers the commands create-hyperpy-app runs with the files the real tools leave behind
+(a vite react-ts project, node_modules, a uv virtual environment...), after a configurable delay:
+
+    toolchain.py <tool> <args...>
+
+    HYPERPY_STUB_LATENCY        seconds every command takes, or per command: "uv sync=0.5,bun install=1.2,*=0.05"
+    HYPERPY_STUB_PACKAGE_BYTES  size of the fake module written for each installed package (4096)
+    HYPERPY_STUB_FAIL           command that exits with an error, e.g. "bun install"
+
+Offline runs are checked like the real tools would: with UV_OFFLINE uv sync needs every wheel in UV_FIND_LINKS,
+npm (npm_config_offline) and bun (--prefer-offline) need every package in their package cache, which online
+installs fill (npm_config_cache, BUN_INSTALL_CACHE_DIR).
+
+bench_scaffold.py puts a wrapper per tool on PATH, see make_stub_bin there.
+"""
+import os
+import re
+import sys
+import json
+import time
+
+TOOLS = ["uv", "bun", "bunx", "npm", "npx", "node"]
+VERSIONS = {"uv": "uv 0.8.0 (stub)", "bun": "1.2.19", "npm": "10.9.2", "node": "v22.17.0"}
+
+VITE_DEPENDENCIES = {"react": "^19.1.0", "react-dom": "^19.1.0"}
+VITE_DEV_DEPENDENCIES = {
+    "@eslint/js": "^9.30.1",
+    "@types/react": "^19.1.8",
+    "@types/react-dom": "^19.1.6",
+    "@vitejs/plugin-react": "^4.6.0",
+    "eslint": "^9.30.1",
+    "typescript": "~5.8.3",
+    "vite": "^7.0.4",
+}
+SHADCN_DEPENDENCIES = {"class-variance-authority": "^0.7.1", "clsx": "^2.1.1", "lucide-react": "^0.525.0", "tailwind-merge": "^3.3.1"}
+
+
+def command_latency(command: str, spec: str) -> float:
+    """Delay for a command ("bun install") from a latency spec, the first matching entry wins."""
+    if "=" not in spec:
+        return float(spec or 0)
+    delays = dict(entry.rsplit("=", 1) for entry in spec.split(",") if entry.strip())
+    delays = {key.strip(): float(value) for key, value in delays.items()}
+    for key in (command, command.split(" ")[0], "*"):
+        if key in delays:
+            return delays[key]
+    return 0.0
+
+
+def write(path: str, content: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def write_json(path: str, data: dict):
+    write(path, json.dumps(data, indent=2) + "\n")
+
+
+def read_json(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# uv
+
+def pyproject_dependencies(project_dir: str) -> list[str]:
+    path = os.path.join(project_dir, "pyproject.toml")
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        block = re.search(r"dependencies\s*=\s*\[(.*?)\]", f.read(), re.S)
+    return re.findall(r'"([^"]+)"', block.group(1)) if block else []
+
+
+def distribution_name(dependency: str) -> str:
+    return re.split(r"[<>=~!\[ ;]", dependency)[0].lower()
+
+
+def uv_lock(project_dir: str, dependencies: list[str]):
+    packages = "".join(
+        f'\n[[package]]\nname = "{distribution_name(dependency)}"\nversion = "1.0.0"\n'
+        f'source = {{ registry = "https://pypi.org/simple" }}\n'
+        for dependency in sorted(dependencies)
+    )
+    write(os.path.join(project_dir, "uv.lock"), f'version = 1\nrevision = 2\nrequires-python = ">=3.11"\n{packages}')
+
+
+def lock_packages(project_dir: str) -> list[str]:
+    with open(os.path.join(project_dir, "uv.lock"), "r") as f:
+        return re.findall(r'^name = "([^"]+)"', f.read(), re.M)
+
+
+def wheel_name(name: str) -> str:
+    return f"{name.replace('-', '_')}-1.0.0-py3-none-any.whl"
+
+
+def uv_sync(project_dir: str, frozen: bool):
+    dependencies = pyproject_dependencies(project_dir)
+    if os.environ.get("UV_OFFLINE"):
+        # Offline every distribution has to come from the --find-links wheelhouse
+        wheelhouse = os.environ.get("UV_FIND_LINKS", "")
+        missing = [dep for dep in dependencies if not os.path.exists(os.path.join(wheelhouse, wheel_name(distribution_name(dep))))]
+        if missing:
+            print(f"stub uv: offline and no wheels for {', '.join(missing)} in {wheelhouse or 'the find links'}", file=sys.stderr)
+            raise SystemExit(2)
+    if not frozen and not os.path.exists(os.path.join(project_dir, "uv.lock")):
+        uv_lock(project_dir, dependencies)
+    venv = os.path.join(project_dir, ".venv")
+    write(os.path.join(venv, "pyvenv.cfg"), f"home = {os.path.dirname(sys.executable)}\nversion_info = 3.13.0\n")
+    write(os.path.join(venv, "bin", "python"), "")
+    site_packages = os.path.join(venv, "lib", "python3.13", "site-packages")
+    for dependency in dependencies:
+        name = distribution_name(dependency).replace("-", "_")
+        write(os.path.join(site_packages, name, "__init__.py"), "# stub\n" * 64)
+        write(os.path.join(site_packages, f"{name}-1.0.0.dist-info", "METADATA"), f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0.0\n")
+
+
+def run_uv(args: list[str]) -> int:
+    command = args[0]
+    if command == "init":
+        name = os.path.basename(os.getcwd())
+        write("pyproject.toml", f'[project]\nname = "{name}"\nversion = "0.1.0"\nrequires-python = ">=3.11"\ndependencies = []\n')
+        write("README.md", "")
+        write("main.py", f'def main():\n    print("Hello from {name}!")\n')
+        write(".python-version", "3.13\n")
+    elif command == "add":
+        packages = [arg for arg in args[1:] if not arg.startswith("-")]
+        with open("pyproject.toml", "r") as f:
+            pyproject = f.read()
+        listed = "".join(f'\n    "{package}",' for package in packages)
+        write("pyproject.toml", re.sub(r"dependencies\s*=\s*\[", lambda match: match.group(0) + listed, pyproject, count=1))
+        uv_lock(".", pyproject_dependencies("."))
+        uv_sync(".", frozen=True)
+    elif command == "lock":
+        uv_lock(".", pyproject_dependencies("."))
+    elif command == "sync":
+        uv_sync(".", frozen="--frozen" in args)
+    elif command == "export":
+        output = args[args.index("-o") + 1]
+        with open("pyproject.toml", "r") as f:
+            project = re.search(r'^name = "([^"]+)"', f.read(), re.M).group(1)
+        write(output, "".join(f"{name}==1.0.0\n" for name in lock_packages(".") if name != project))
+    elif args[:4] == ["tool", "run", "pip", "download"]:
+        # uv tool run pip download --dest <dir> --requirement <file>
+        dest, requirements = args[args.index("--dest") + 1], args[args.index("--requirement") + 1]
+        with open(requirements, "r") as f:
+            for line in f.read().splitlines():
+                write(os.path.join(dest, wheel_name(line.split("==")[0])), "stub wheel\n")
+    elif command != "remove":
+        return unhandled("uv", args)
+    return 0
+
+
+# bun / npm
+
+def vite_project(name: str):
+    """The files `create vite@latest <name> --template react-ts` writes."""
+    write_json(os.path.join(name, "package.json"), {
+        "name": name,
+        "private": True,
+        "version": "0.0.0",
+        "type": "module",
+        "scripts": {"dev": "vite", "build": "tsc -b && vite build", "lint": "eslint .", "preview": "vite preview"},
+        "dependencies": VITE_DEPENDENCIES,
+        "devDependencies": VITE_DEV_DEPENDENCIES,
+    })
+    write_json(os.path.join(name, "tsconfig.json"), {"files": [], "references": [{"path": "./tsconfig.app.json"}, {"path": "./tsconfig.node.json"}]})
+    compiler_options = {
+        "target": "ES2022",
+        "useDefineForClassFields": True,
+        "lib": ["ES2022", "DOM", "DOM.Iterable"],
+        "module": "ESNext",
+        "skipLibCheck": True,
+        "moduleResolution": "bundler",
+        "allowImportingTsExtensions": True,
+        "verbatimModuleSyntax": True,
+        "moduleDetection": "force",
+        "noEmit": True,
+        "jsx": "react-jsx",
+        "strict": True,
+        "noUnusedLocals": True,
+        "noUnusedParameters": True,
+        "noFallthroughCasesInSwitch": True,
+    }
+    write_json(os.path.join(name, "tsconfig.app.json"), {
+        "compilerOptions": {"tsBuildInfoFile": "./node_modules/.tmp/tsconfig.app.tsbuildinfo", **compiler_options},
+        "include": ["src"],
+    })
+    write_json(os.path.join(name, "tsconfig.node.json"), {
+        "compilerOptions": {"tsBuildInfoFile": "./node_modules/.tmp/tsconfig.node.tsbuildinfo", **compiler_options, "lib": ["ES2023"]},
+        "include": ["vite.config.ts"],
+    })
+    write(os.path.join(name, "vite.config.ts"), (
+        "import { defineConfig } from 'vite'\nimport react from '@vitejs/plugin-react'\n\n"
+        "// https://vite.dev/config/\nexport default defineConfig({\n  plugins: [react()],\n})\n"
+    ))
+    write(os.path.join(name, "index.html"), (
+        '<!doctype html>\n<html lang="en">\n  <head>\n    <meta charset="UTF-8" />\n'
+        '    <link rel="icon" type="image/svg+xml" href="/vite.svg" />\n    <title>Vite + React + TS</title>\n  </head>\n'
+        '  <body>\n    <div id="root"></div>\n    <script type="module" src="/src/main.tsx"></script>\n  </body>\n</html>\n'
+    ))
+    write(os.path.join(name, "src", "main.tsx"), (
+        "import { StrictMode } from 'react'\nimport { createRoot } from 'react-dom/client'\nimport './index.css'\n"
+        "import App from './App.tsx'\n\ncreateRoot(document.getElementById('root')!).render(\n  <StrictMode>\n    <App />\n  </StrictMode>,\n)\n"
+    ))
+    write(os.path.join(name, "src", "App.tsx"), "import './App.css'\n\nfunction App() {\n  return <h1>Vite + React</h1>\n}\n\nexport default App\n")
+    write(os.path.join(name, "src", "App.css"), "#root {\n  max-width: 1280px;\n  margin: 0 auto;\n  padding: 2rem;\n}\n" * 8)
+    write(os.path.join(name, "src", "index.css"), ":root {\n  font-family: system-ui, Avenir, Helvetica, Arial, sans-serif;\n}\n" * 8)
+    write(os.path.join(name, "src", "vite-env.d.ts"), '/// <reference types="vite/client" />\n')
+    write(os.path.join(name, "public", "vite.svg"), '<svg xmlns="http://www.w3.org/2000/svg"></svg>\n')
+    write(os.path.join(name, "eslint.config.js"), "import js from '@eslint/js'\n\nexport default [js.configs.recommended]\n")
+    write(os.path.join(name, ".gitignore"), "node_modules\ndist\n*.local\n")
+    write(os.path.join(name, "README.md"), "# React + TypeScript + Vite\n")
+
+
+def package_cache(tool: str) -> str | None:
+    return os.environ.get("BUN_INSTALL_CACHE_DIR" if tool == "bun" else "npm_config_cache")
+
+
+def use_package_cache(tool: str, names: list[str], offline: bool):
+    """Offline every package has to be in the package cache already, online installs fill it."""
+    cache = package_cache(tool)
+    if offline:
+        missing = [name for name in names if not cache or not os.path.exists(os.path.join(cache, name.replace("/", "+")))]
+        if missing:
+            print(f"stub {tool}: offline and {', '.join(missing)} not in the package cache", file=sys.stderr)
+            raise SystemExit(1)
+    elif cache:
+        for name in names:
+            write(os.path.join(cache, name.replace("/", "+")), "stub package\n")
+
+
+def install_packages(tool: str, packages: list[str], dev: bool, offline: bool = False):
+    """Add the packages to package.json and write node_modules (and a lockfile) for every dependency."""
+    package_json = read_json("package.json") if os.path.exists("package.json") else {"name": os.path.basename(os.getcwd())}
+    section = "devDependencies" if dev else "dependencies"
+    for package in packages:
+        name = package.rsplit("@", 1)[0] if package.rfind("@") > 0 else package
+        package_json.setdefault(section, {})[name] = "^1.0.0"
+    write_json("package.json", package_json)
+
+    size = int(os.environ.get("HYPERPY_STUB_PACKAGE_BYTES", "4096"))
+    installed = {**package_json.get("dependencies", {}), **package_json.get("devDependencies", {})}
+    use_package_cache(tool, sorted(installed), offline)
+    for name, version in installed.items():
+        module_dir = os.path.join("node_modules", name)
+        write_json(os.path.join(module_dir, "package.json"), {"name": name, "version": version.lstrip("^~"), "main": "index.js"})
+        write(os.path.join(module_dir, "index.js"), ("// stub module\n" * (size // 15 + 1))[:size])
+    for binary in ("vite", "tsc", "eslint"):
+        write(os.path.join("node_modules", ".bin", binary), "#!/bin/sh\n")
+    if tool == "bun":
+        write("bun.lock", json.dumps({"lockfileVersion": 1, "packages": sorted(installed)}, indent=2))
+    else:
+        write_json("package-lock.json", {"name": package_json["name"], "lockfileVersion": 3, "packages": {f"node_modules/{name}": {} for name in sorted(installed)}})
+
+
+def run_package_manager(tool: str, args: list[str]) -> int:
+    command = args[0]
+    if command == "create":
+        # bun create vite@latest <name> --template react-ts / npm create vite@latest <name> -- --template react-ts
+        vite_project(args[2])
+    elif command in ("install", "add", "i"):
+        packages = [arg for arg in args[1:] if not arg.startswith("-")]
+        offline = "--prefer-offline" in args if tool == "bun" else os.environ.get("npm_config_offline") == "true"
+        install_packages(tool, packages, dev=bool({"-d", "-D", "--dev", "--save-dev"} & set(args)), offline=offline)
+    elif command == "init":
+        write_json("package.json", {"name": os.path.basename(os.getcwd()), "version": "1.0.0"})
+    else:
+        return unhandled(tool, args)
+    return 0
+
+
+def run_package_runner(tool: str, args: list[str]) -> int:
+    """bunx/npx, only `shadcn@latest init` is used."""
+    args = [arg for arg in args if arg != "--bun"]
+    if not args or not args[0].startswith("shadcn") or args[1:2] != ["init"]:
+        return unhandled(tool, args)
+    write_json("components.json", {
+        "$schema": "https://ui.shadcn.com/schema.json",
+        "style": "new-york",
+        "tsx": True,
+        "tailwind": {"config": "", "css": "src/index.css", "baseColor": "neutral", "cssVariables": True},
+        "aliases": {"components": "@/components", "utils": "@/lib/utils", "ui": "@/components/ui"},
+        "iconLibrary": "lucide",
+    })
+    write(os.path.join("src", "lib", "utils.ts"), (
+        'import { clsx, type ClassValue } from "clsx"\nimport { twMerge } from "tailwind-merge"\n\n'
+        "export function cn(...inputs: ClassValue[]) {\n  return twMerge(clsx(inputs))\n}\n"
+    ))
+    install_packages("bun" if tool == "bunx" else "npm", list(SHADCN_DEPENDENCIES), dev=False)
+    return 0
+
+
+def unhandled(tool: str, args: list[str]) -> int:
+    print(f"stub {tool}: unhandled command {' '.join(args)}", file=sys.stderr)
+    return 1
+
+
+def main(argv: list[str]) -> int:
+    tool, args = os.path.basename(argv[0]), argv[1:]
+    if not args:
+        return unhandled(tool, args)
+    command = " ".join([tool, *args[:1]])
+    time.sleep(command_latency(command, os.environ.get("HYPERPY_STUB_LATENCY", "0")))
+    if os.environ.get("HYPERPY_STUB_FAIL") == command:
+        print(f"stub {tool}: failing {command} on purpose", file=sys.stderr)
+        return 1
+
+    if args[0] == "--version":
+        print(VERSIONS.get(tool, VERSIONS["bun" if tool == "bunx" else "npm"]))
+        return 0
+    if tool == "uv":
+        return run_uv(args)
+    if tool in ("bun", "npm"):
+        return run_package_manager(tool, args)
+    if tool in ("bunx", "npx"):
+        return run_package_runner(tool, args)
+    return unhandled(tool, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
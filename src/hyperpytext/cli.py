@@ -0,0 +1,516 @@
+import os
+import shutil
+import typer
+from enum import Enum
+from typer.core import TyperGroup
+#from rich.progress import Progress, SpinnerColumn, TextColumn
+from hyperpytext.utils.console_utils import console
+from hyperpytext.utils.options_utils import MAX_CONCURRENCY, PACKAGE_MANAGERS, AppOptions
+
+# The commands import rich widgets and the scaffold utils (asyncio, yaml...) when they run,
+# so `create-hyperpy-app --help` and shell completions only pay for typer
+
+# SERVER
+# TODO: Make the server template more precise: app / library
+# TODO: Make a reference to the host and port on this file to reference on the vite server proxy and .env file
+# TODO: Handle all authentication redirects, at least to specific endpoints, use piccolo docs for reference (all their auth endpoints have redirects)
+# TODO: Move the root route to a new yaml file: routes_root.yaml
+
+# CLIENT
+# TODO: Need to test installation with npm to see that everything is set up correctly, bun is working perfectly
+# TODO: I want to add some agent tooling to add shadcn components perhaps, need to brainstorm a bit
+
+# APP
+# TODO: Need to create LLM md files for quick setup, a complete PRD with the project information for quick LLM digestion and setup
+
+class DefaultCommandGroup(TyperGroup):
+    """Routes `create-hyperpy-app <app_name>` to the default command, so subcommands like `batch` can live next to it."""
+    default_command = "new"
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and not args[0].startswith("-"):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+class FsyncPolicy(str, Enum):
+    none = "none"
+    file = "file"
+    tree = "tree"
+
+
+app = typer.Typer(help="Create a new HyperPy application", cls=DefaultCommandGroup)
+
+HEADER = """[bold cyan]
+██╗  ██╗██╗   ██╗██████╗ ███████╗██████╗ ██████╗ ██╗   ██╗████████╗███████╗██╗  ██╗████████╗
+██║  ██║╚██╗ ██╔╝██╔══██╗██╔════╝██╔══██╗██╔══██╗╚██╗ ██╔╝╚══██╔══╝██╔════╝╚██╗██╔╝╚══██╔══╝
+███████║ ╚████╔╝ ██████╔╝█████╗  ██████╔╝██████╔╝ ╚████╔╝    ██║   █████╗   ╚███╔╝    ██║
+██╔══██║  ╚██╔╝  ██╔═══╝ ██╔══╝  ██╔══██╗██╔═══╝   ╚██╔╝     ██║   ██╔══╝   ██╔██╗    ██║
+██║  ██║   ██║   ██║     ███████╗██║  ██║██║        ██║      ██║   ███████╗██╔╝ ██╗   ██║
+╚═╝  ╚═╝   ╚═╝   ╚═╝     ╚══════╝╚═╝  ╚═╝╚═╝        ╚═╝      ╚═╝   ╚══════╝╚═╝  ╚═╝   ╚═╝   [/bold cyan]
+
+[bold blue]🚀 Create modern web applications with Python and React[/bold blue]
+[bold green]🔗 Project repo: https://github.com/minollisantiago/hyperpytext[/bold green]
+"""
+
+@app.command("new")
+def main(
+    app_name: str,
+    concurrency: int = typer.Option(MAX_CONCURRENCY, "--concurrency", "-c", min=1, help="Maximum number of setup steps running at the same time"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Build the client app from scratch, without the snapshot cache"),
+    plan: bool = typer.Option(False, "--plan", help="Show the files and setup steps for the selected options, without creating anything"),
+    fsync: FsyncPolicy = typer.Option(FsyncPolicy.none, "--fsync", help="Sync the template files to disk: not at all, each file, or the whole tree at once"),
+    resume: bool = typer.Option(False, "--resume", help="Continue a failed run: skip the steps that completed with the same inputs"),
+    profile: str | None = typer.Option(None, "--profile", help="Write the timing of every setup step to this file, as a Chrome trace (chrome://tracing, Perfetto)"),
+    offline: bool = typer.Option(False, "--offline", help="Install everything from the local caches filled by `cache warm`, without any registry"),
+):
+    """Create a new HyperPy application with FastAPI backend and React frontend."""
+    from rich.panel import Panel
+    from rich.prompt import Confirm, Prompt
+    from hyperpytext.utils.dag_utils import StepFailedError
+    from hyperpytext.utils.journal_utils import StepJournal
+    from hyperpytext.utils.profile_utils import Profiler, profiling
+    from hyperpytext.utils.scaffold_utils import check_toolchain, scaffold_app
+
+    console.print(HEADER)
+    console.print(Panel(f"Creating a new HyperPy app in {os.path.join(os.getcwd(), app_name)}"))
+    app_dir = os.path.abspath(app_name)
+
+    # A resumed run keeps the answers of the run it continues
+    journal_options = StepJournal.load(app_dir).get("options") if resume else None
+    if journal_options:
+        options = AppOptions(**journal_options)
+        console.print(f"Resuming with the previous answers: {', '.join(f'{key}={value}' for key, value in journal_options.items())}")
+    else:
+        # Server prompts
+        piccolo_auth = Confirm.ask("Would you like to include authentication with Piccolo?", default=False)
+        piccolo_example = Confirm.ask("Would you like to include a Piccolo db app example for SQLite?", default=False)
+        sqlite_profiles = Confirm.ask("Would you like to tune the SQLite databases (WAL, pragmas, pooled connections)?", default=False)
+
+        # Client prompts
+        package_manager = Prompt.ask("Which package manager would you like to use?", choices=PACKAGE_MANAGERS, default="bun")
+        fonts = Confirm.ask("Would you like to install Geist fonts?", default=False)
+        shadcn = Confirm.ask("Would you like to install Shadcn UI?", default=False)
+
+        options = AppOptions(
+            piccolo_auth=piccolo_auth,
+            piccolo_example=piccolo_example,
+            sqlite_profiles=sqlite_profiles,
+            package_manager=package_manager,
+            fonts=fonts,
+            shadcn=shadcn,
+        )
+    package_manager = options.package_manager
+
+    if plan:
+        print_plan(app_dir, options, use_cache=not no_cache)
+        return
+
+    # Offline the tool prompts (shadcn init) take their defaults, only a cached shadcn client works without the registry
+    interactive = not offline
+    if offline and not use_offline_caches([(app_name, options)], use_cache=not no_cache, interactive=interactive):
+        raise typer.Exit(code=1)
+
+    #Create app directory
+    os.makedirs(app_dir, exist_ok=True)
+
+    profiler = Profiler() if profile else None
+    try:
+        with profiling(profiler, app_name):
+            # Check for uv and the client package manager
+            if not check_toolchain(package_manager):
+                return
+
+            console.print("⌛ This process might take a bit. Please be patient.")
+
+            #Progress instance
+            #progress = Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console)
+            #with progress:
+
+            ## Server and client setup
+            scaffold_app(app_dir, options, interactive=interactive, max_concurrency=concurrency, use_cache=not no_cache, fsync=fsync.value, resume=resume)
+    except StepFailedError as e:
+        console.print(f"🚩 {e}")
+        console.print(f"Run `create-hyperpy-app {app_name} --resume` to retry from the failed step.")
+        if profiler:
+            print_profile(profiler)
+        raise typer.Exit(code=1)
+    finally:
+        if profiler:
+            profiler.write(profile)
+            console.print(f"✔ Profile written to {profile}")
+
+    # Task complete message
+    console.print(Panel(f"App '{app_name}' has been created successfully!", style="bold green"))
+    print_scripts(package_manager)
+    if profiler:
+        print_profile(profiler)
+
+
+@app.command()
+def batch(
+    spec_file: str = typer.Argument(..., help="Yaml file with the apps to create and their options"),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Number of apps created at the same time"),
+    output_dir: str = typer.Option(".", "--output-dir", "-o", help="Directory where the apps are created"),
+    concurrency: int = typer.Option(MAX_CONCURRENCY, "--concurrency", "-c", min=1, help="Maximum number of setup steps running at the same time, per app"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Build the client apps from scratch, without the snapshot cache"),
+    plan: bool = typer.Option(False, "--plan", help="Show the files and setup steps of every app, without creating anything"),
+    fsync: FsyncPolicy = typer.Option(FsyncPolicy.none, "--fsync", help="Sync the template files to disk: not at all, each file, or the whole tree at once"),
+    resume: bool = typer.Option(False, "--resume", help="Continue failed runs: skip the steps that completed with the same inputs"),
+    profile: str | None = typer.Option(None, "--profile", help="Write the timing of every setup step to this file, as a Chrome trace with a process per app"),
+    offline: bool = typer.Option(False, "--offline", help="Install everything from the local caches filled by `cache warm`, without any registry"),
+):
+    """Create several HyperPy applications from a spec file, without prompts."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from hyperpytext.utils.profile_utils import Profiler
+    from hyperpytext.utils.scaffold_utils import check_toolchain, load_specs, run_batch
+
+    console.print(HEADER)
+    try:
+        specs = load_specs(spec_file)
+    except (OSError, ValueError) as e:
+        console.print(f"🚩 Invalid spec file: {e}")
+        raise typer.Exit(code=1)
+
+    if plan:
+        for spec in specs:
+            console.print(Panel(f"{spec.app_name}"))
+            print_plan(os.path.abspath(os.path.join(output_dir, spec.app_name)), spec.options, interactive=False, use_cache=not no_cache)
+        return
+
+    # Check every package manager in use only once, before starting any app
+    for package_manager in sorted({spec.options.package_manager for spec in specs}):
+        if not check_toolchain(package_manager):
+            raise typer.Exit(code=1)
+    if offline and not use_offline_caches([(spec.app_name, spec.options) for spec in specs], use_cache=not no_cache, interactive=False):
+        raise typer.Exit(code=1)
+
+    console.print(Panel(f"Creating {len(specs)} HyperPy apps in {os.path.abspath(output_dir)} ({jobs} at a time)"))
+    console.print("⌛ This process might take a bit. Please be patient.")
+    profiler = Profiler() if profile else None
+    results = run_batch(
+        specs,
+        output_dir,
+        jobs=jobs,
+        max_concurrency=concurrency,
+        use_cache=not no_cache,
+        fsync=fsync.value,
+        resume=resume,
+        profiler=profiler,
+    )
+
+    # Results table
+    results_table = Table(show_header=True, header_style="bold magenta")
+    results_table.add_column("App", style="cyan")
+    results_table.add_column("Status")
+    results_table.add_column("Time", style="yellow")
+    results_table.add_column("Directory", style="green")
+    for result in results:
+        status = f"[red]🚩 {result.error}[/red]" if result.error else "[green]✔ Created[/green]"
+        results_table.add_row(result.app_name, status, f"{result.duration:.1f}s", result.app_dir)
+
+    console.print("\n")
+    console.print(results_table)
+    console.print("\n")
+    if profiler:
+        profiler.write(profile)
+        print_profile(profiler)
+        console.print(f"✔ Profile written to {profile}")
+
+    if any(result.error for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def update(
+    app_dir: str = typer.Argument(..., help="Folder of an app created with create-hyperpy-app"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would change, without writing anything"),
+    fsync: FsyncPolicy = typer.Option(FsyncPolicy.none, "--fsync", help="Sync the template files to disk: not at all, each file, or the whole tree at once"),
+):
+    """Re-apply the installed templates to an existing app, keeping your changes."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from hyperpytext.utils.scaffold_utils import update_app
+
+    app_dir = os.path.abspath(app_dir)
+    console.print(Panel(f"Updating the HyperPy app in {app_dir}"))
+    try:
+        result = update_app(app_dir, fsync=fsync.value, dry_run=dry_run)
+    except FileNotFoundError as e:
+        console.print(f"🚩 {e}")
+        raise typer.Exit(code=1)
+
+    styles = {"added": "green", "updated": "green", "merged": "yellow", "conflict": "red"}
+    changes = [file for file in result.files if file.action != "unchanged"]
+    if changes:
+        files_table = Table(title="Would change" if dry_run else "Changes", show_header=True, header_style="bold magenta")
+        files_table.add_column("File", style="cyan")
+        files_table.add_column("Template", style="yellow")
+        files_table.add_column("Change")
+        for file in sorted(changes, key=lambda file: file.path):
+            style = styles.get(file.action, "dim")
+            files_table.add_row(file.path, file.group, f"[{style}]{file.action}[/{style}]")
+        console.print(files_table)
+    else:
+        console.print("✔ Every template file is up to date")
+
+    if result.dependencies == "pending" and dry_run:
+        console.print("The server dependencies changed, uv would sync the environment")
+    elif result.dependencies == "unchanged":
+        console.print("✔ Server dependencies unchanged, uv didn't run")
+
+    conflicts = [file.path for file in changes if file.action == "conflict"]
+    if conflicts:
+        console.print(f"🚩 {len(conflicts)} files have conflicts with your changes, look for the <<<<<<< markers: {', '.join(conflicts)}")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def serve(
+    socket: str | None = typer.Option(None, "--socket", help="Listen on this unix socket instead of a localhost port"),
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on, keep it local: requests create folders on this machine"),
+    port: int = typer.Option(8787, "--port", help="Port to listen on"),
+    output_dir: str = typer.Option(".", "--output-dir", "-o", help="Directory where the apps are created"),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Number of apps created at the same time"),
+    concurrency: int = typer.Option(MAX_CONCURRENCY, "--concurrency", "-c", min=1, help="Maximum number of setup steps running at the same time, per app"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Build the client apps from scratch, without the snapshot cache"),
+    fsync: FsyncPolicy = typer.Option(FsyncPolicy.none, "--fsync", help="Sync the template files to disk: not at all, each file, or the whole tree at once"),
+):
+    """Create apps on request: a local daemon taking json scaffold requests over HTTP, with warm caches."""
+    import asyncio
+    from rich.panel import Panel
+    from hyperpytext.utils.daemon_utils import ScaffoldDaemon
+
+    daemon = ScaffoldDaemon(output_dir, jobs=jobs, max_concurrency=concurrency, use_cache=not no_cache, fsync=fsync.value)
+    warm = daemon.warm_up()
+    tools = ", ".join(f"{tool} {version}" for tool, version in warm["tools"].items() if version)
+    console.print(f"✔ Loaded {warm['templates']} templates, tools: {tools or 'none found'}")
+
+    address = f"unix socket {socket}" if socket else f"http://{host}:{port}"
+    def ready(server):
+        console.print(Panel(f"Serving on {address}, apps go to {daemon.output_dir}\nPOST /scaffold, GET /health", style="bold green"))
+
+    try:
+        asyncio.run(daemon.serve(socket_path=socket, host=host, port=port, ready=ready))
+        console.print("✔ Stopped")
+    except KeyboardInterrupt:
+        console.print("✔ Stopped")
+    except OSError as e:
+        console.print(f"🚩 Could not listen on {address}: {e}")
+        raise typer.Exit(code=1)
+
+
+cache_app = typer.Typer(help="Manage the local caches of HyperPyText")
+app.add_typer(cache_app, name="cache")
+
+
+@cache_app.command("warm")
+def cache_warm(
+    package_manager: list[str] | None = typer.Option(None, "--package-manager", "-p", help="Package manager to warm the cache for, repeat for several (default: every one installed)"),
+    concurrency: int = typer.Option(MAX_CONCURRENCY, "--concurrency", "-c", min=1, help="Maximum number of setup steps running at the same time"),
+):
+    """Fill the local caches `--offline` runs install from: server wheels, bun/npm packages and the client apps."""
+    from rich.panel import Panel
+    from hyperpytext.utils.offline_utils import use_package_caches
+    from hyperpytext.utils.scaffold_utils import check_toolchain, warm_cache
+
+    package_managers = package_manager or [name for name in PACKAGE_MANAGERS if shutil.which(name)]
+    invalid = [name for name in package_managers if name not in PACKAGE_MANAGERS]
+    if invalid:
+        console.print(f"🚩 Unknown package manager: {', '.join(invalid)}, choose from {', '.join(PACKAGE_MANAGERS)}")
+        raise typer.Exit(code=1)
+    for name in package_managers:
+        if not check_toolchain(name):
+            raise typer.Exit(code=1)
+
+    console.print(Panel(f"Warming the offline caches for {', '.join(package_managers) or 'the server only'}"))
+    use_package_caches()
+    warm_cache(package_managers, max_concurrency=concurrency)
+    console.print(Panel("The caches are ready, create apps with --offline", style="bold green"))
+
+
+def use_offline_caches(apps: list[tuple[str, AppOptions]], use_cache: bool = True, interactive: bool = True) -> bool:
+    """Switch this process to the offline caches, False (with what's missing) when an app can't be created offline."""
+    from hyperpytext.utils.offline_utils import use_package_caches
+    from hyperpytext.utils.scaffold_utils import check_offline
+
+    ready = True
+    for app_name, options in apps:
+        missing = check_offline(options, use_cache=use_cache, interactive=interactive)
+        if missing:
+            console.print(f"🚩 '{app_name}' can't be created offline: {'; '.join(missing)}. Run `create-hyperpy-app cache warm` first.")
+            ready = False
+    if ready:
+        use_package_caches(offline=True)
+    return ready
+
+
+def print_plan(app_dir: str, options: AppOptions, interactive: bool = True, use_cache: bool = True):
+    """Print the template files an app gets for these options and the setup steps, nothing is written."""
+    from rich.table import Table
+    from hyperpytext.utils.scaffold_utils import app_steps, plan_app
+
+    for plan in plan_app(app_dir, options):
+        files_table = Table(title=f"{plan.section.capitalize()} files", show_header=True, header_style="bold magenta")
+        files_table.add_column("Template", style="cyan")
+        files_table.add_column("File", style="green")
+        files_table.add_column("Size", style="yellow", justify="right")
+        for file in plan.files:
+            files_table.add_row(file.template, os.path.normpath(os.path.join(plan.root, file.filename)), f"{len(file.content.encode())} B")
+
+        console.print(files_table)
+        console.print(f"{len(plan.files)} files, {plan.size} bytes")
+        for group, missing in plan.skipped:
+            console.print(f"Skipped {group.template} (needs {', '.join(missing)})")
+        console.print("\n")
+
+    steps_table = Table(title="Setup steps", show_header=True, header_style="bold magenta")
+    steps_table.add_column("Step", style="cyan")
+    steps_table.add_column("After", style="yellow")
+    for step in app_steps(app_dir, options, interactive=interactive, use_cache=use_cache):
+        steps_table.add_row(step.name, ", ".join(step.deps) or "-")
+    console.print(steps_table)
+
+
+def print_profile(profiler):
+    """Print the time spent on each profiled span, added up by name (every `uv add`, every app in batch mode...)."""
+    from rich.table import Table
+    from hyperpytext.utils.process_utils import process_stats
+
+    profile_table = Table(title="Profile", show_header=True, header_style="bold magenta")
+    profile_table.add_column("Span", style="cyan")
+    profile_table.add_column("Calls", justify="right")
+    profile_table.add_column("Time", style="yellow", justify="right")
+    profile_table.add_column("Bytes", justify="right")
+    profile_table.add_column("Exit codes", style="green")
+    for summary in profiler.summary():
+        exit_codes = ", ".join(str(code) for code in sorted(summary.exit_codes))
+        if summary.errors:
+            exit_codes = f"{exit_codes} [red]{summary.errors} failed[/red]".strip()
+        profile_table.add_row(
+            summary.name,
+            str(summary.calls),
+            f"{summary.duration:.2f}s",
+            f"{summary.bytes}" if summary.bytes else "-",
+            exit_codes or "-",
+        )
+    console.print(profile_table)
+    stats = process_stats()
+    console.print(
+        f"Processes: {stats.spawns} spawned, {stats.child_time:.2f}s in children, "
+        f"{stats.retries} retried, {stats.timeouts} timed out"
+    )
+    console.print("\n")
+
+
+def print_scripts(package_manager: str):
+    """Print the tables with the scripts available for the server and client."""
+    from rich.table import Table
+
+    # Create tables for scripts
+    console.print("🐍 Python Server Scripts")
+    server_table = Table(show_header=True, header_style="bold magenta")
+    server_table.add_column("Command", style="cyan")
+    server_table.add_column("Description", style="green")
+    server_table.add_column("Directory", style="yellow")
+
+    server_table.add_row(
+        "uv run run_server.py",
+        "Start Python server, one worker per CPU",
+        "./server"
+    )
+    server_table.add_row(
+        "uv run run_server.py --workers 4",
+        "Start Python server with 4 workers",
+        "./server"
+    )
+    server_table.add_row(
+        "uv run run_server.py --setup-only",
+        "Run the database migrations and setup",
+        "./server"
+    )
+    server_table.add_row(
+        "kill -HUP <run_server.py pid>",
+        "Restart the server workers one at a time",
+        "./server"
+    )
+    server_table.add_row(
+        "uv run run_server.py --reload",
+        "Start Python development server",
+        "./server"
+    )
+    server_table.add_row(
+        "uv run run_worker.py",
+        "Start the job queue worker",
+        "./server"
+    )
+    server_table.add_row(
+        "uvicorn src.app:app",
+        "Start Python server with Uvicorn",
+        "./server"
+    )
+    server_table.add_row(
+        "uvicorn src.app:app --reload",
+        "Start Python development server with Uvicorn",
+        "./server"
+    )
+
+    console.print("⚛️ React Client Scripts")
+    client_table = Table(show_header=True, header_style="bold magenta")
+    client_table.add_column("Command", style="cyan")
+    client_table.add_column("Description", style="green")
+    client_table.add_column("Directory", style="yellow")
+
+    # Add package manager specific commands
+    if package_manager == "bun":
+        client_table.add_row(
+            "bun run dev",
+            "Start Vite development server",
+            "./client"
+        )
+        client_table.add_row(
+            "bun run build",
+            "Build Vite production bundle",
+            "./client"
+        )
+        client_table.add_row(
+            "bun run build-css",
+            "Build Tailwind CSS",
+            "./client"
+        )
+        client_table.add_row(
+            "bun run watch-css",
+            "Watch and build Tailwind CSS changes",
+            "./client"
+        )
+    else:  # npm
+        client_table.add_row(
+            "npm run start",
+            "Start Vite development server",
+            "./client"
+        )
+        client_table.add_row(
+            "npm run build",
+            "Build Vite production bundle",
+            "./client"
+        )
+        client_table.add_row(
+            "npm run build-css",
+            "Build Tailwind CSS",
+            "./client"
+        )
+        client_table.add_row(
+            "npm run watch-css",
+            "Watch and build Tailwind CSS changes",
+            "./client"
+        )
+
+    console.print("\n")
+    console.print(server_table)
+    console.print("\n")
+    console.print(client_table)
+    console.print("\n")
+
+if __name__ == "__main__":
+    app()
@@ -1,39 +1,21 @@
 import os
-import sys
 import json
 import subprocess
-from rich.console import Console
+from hyperpytext.utils.process_utils import probe_tool, run_command, run_install
 from hyperpytext.utils.npm_utils import update_package_json
 from hyperpytext.utils.npm_vite_utils import configure_vite, remove_default_styles
-from hyperpytext.utils.npm_shadcnui_utils import update_tsconfig_json, update_tsconfig_app_json
-
-console = Console()
-
-def check_system():
-    if sys.platform.startswith('win'):
-        return "windows"
-    elif sys.platform.startswith('darwin'):
-        return "mac"
-    elif sys.platform.startswith('linux'):
-        return "linux"
+from hyperpytext.utils.npm_shadcnui_utils import configure_shadcn_paths
+from hyperpytext.utils.config_utils import ConfigSession
+from hyperpytext.utils.offline_utils import bun_install_args, starter
+from hyperpytext.utils.console_utils import console
 
 
 def check_bun(verbose=False):
-    """Check if bun is installed and available in the system."""
-    try:
-        result = subprocess.run(["bun", "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if verbose:
-            console.print(f"bun version: {result.stdout.strip()}")
-        return True
-    except subprocess.CalledProcessError as e:
-        if verbose:
-            console.print(f"Error running bun: {e}")
-            console.print(f"Stderr: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        if verbose:
-            console.print("🚩 bun command not found in PATH...")
-        return False
+    """Check if bun is installed and available in the system, the probe is cached (see process_utils.probe_tool)."""
+    bun = probe_tool("bun")
+    if verbose:
+        console.print(f"bun version: {bun.version}" if bun else "🚩 bun command not found in PATH...")
+    return bun is not None
 
 
 def bun_install_instructions():
@@ -48,9 +30,9 @@ def bun_install_instructions():
     console.print("4. Verify the installation by running 'bun --version'")
     console.print("Once bun is installed, please run this script again.")
 
-def check_bun_package(package):
-    """Check if a package is installed in the current project."""
-    package_json_ = os.path.join(os.getcwd(), 'package.json')
+def check_bun_package(package, project_dir):
+    """Check if a package is installed in the given project."""
+    package_json_ = os.path.join(project_dir, 'package.json')
     if os.path.exists(package_json_):
         with open(package_json_, 'r') as file:
             package_json = json.load(file)
@@ -61,68 +43,67 @@ def check_bun_package(package):
     return False
 
 
-def setup_tailwind_bun(client_dir, fonts:bool=False):
-    """Setup Tailwind CSS using bun."""
-    os.chdir(client_dir)
+async def setup_tailwind_bun(client_dir, fonts:bool=False):
+    """Setup Tailwind CSS using bun. Failures are re-raised so the step isn't recorded as done, Geist fonts fall back to system fonts."""
     try:
         # Install Tailwind and its dependencies
-        cmd = ["bun", "add", "tailwindcss", "@tailwindcss/vite"]
-        subprocess.run(cmd, check=True)
+        cmd = ["bun", "add", "tailwindcss", "@tailwindcss/vite", *bun_install_args()]
+        await run_install(cmd, cwd=client_dir)
         console.print("✔ Installed Tailwind CSS and its dependencies")
-
-        # Install Geist fonts if specified
-        if fonts:
-            try:
-                subprocess.run(["bun", "add", "geist"], check=True)
-                console.print("✔ Installed Geist fonts")
-            except subprocess.CalledProcessError as e:
-                console.print("🚩 Failed to install Geist fonts. Falling back to system fonts.")
-                console.print(f"Error: {e}")
-
     except subprocess.CalledProcessError as e:
         console.print(f"🚩 Error setting up Tailwind: {e}")
-    except Exception as e:
-        console.print(f"🚩 Unexpected error: {e}")
-    finally:
-        os.chdir(os.path.dirname(client_dir))
+        raise
+
+    # Install Geist fonts if specified
+    if fonts:
+        try:
+            await run_install(["bun", "add", "geist", *bun_install_args()], cwd=client_dir)
+            console.print("✔ Installed Geist fonts")
+        except subprocess.CalledProcessError as e:
+            console.print("🚩 Failed to install Geist fonts. Falling back to system fonts.")
+            console.print(f"Error: {e}")
 
 
-def install_types_bun(project_dir):
-    os.chdir(project_dir)
+async def install_types_bun(project_dir):
     try:
-        subprocess.run(["bun", "add", "-D", "@types/node"], check=True)
+        await run_install(["bun", "add", "-D", "@types/node", *bun_install_args()], cwd=project_dir)
         console.print("✔ Installed @types/node successfully.")
     except subprocess.CalledProcessError:
         console.print("🚩 Failed to install @types/node.")
+        raise
 
 
-def setup_shadcn_bun(project_dir):
-    """Setup Shadcn UI using bun."""
-    update_tsconfig_json(project_dir)
-    update_tsconfig_app_json(project_dir)
-    install_types_bun(project_dir)
-    os.chdir(project_dir)
+async def setup_shadcn_bun(project_dir, interactive: bool = True):
+    """Setup Shadcn UI using bun, the tsconfig path aliases are set with the vite config (see configure_vite_bun)."""
+    await install_types_bun(project_dir)
     console.print("Initializing Shadcn UI...")
-    subprocess.run(["bun", "add", "-d", "shadcn"], check=True)
-    subprocess.run(["bunx", "--bun", "shadcn@latest", "init"], check=True)
-    os.chdir(project_dir)
+    await run_install(["bun", "add", "-d", starter("shadcn"), *bun_install_args()], cwd=project_dir)
+    init_cmd = ["bunx", "--bun", starter("shadcn"), "init"]
+    if not interactive:
+        init_cmd += ["--defaults", "--yes"]
+    await run_command(init_cmd, cwd=project_dir, interactive=interactive)
 
 
-def setup_vite_bun(project_dir, app_name='client', template='react', use_typescript=True, shadcn=False):
-    """Setup a new Vite project using bun."""
-    os.chdir(project_dir)
+async def create_vite_bun(project_dir, app_name='client', template='react', use_typescript=True, interactive: bool = True):
+    """Create the Vite project files using bun."""
     console.print("Setting up Vite...")
     template_with_ts = f"{template}-ts" if use_typescript else template
-    subprocess.run(
-        ["bun", "create", "vite@latest", app_name, "--template", template_with_ts],
-        check=True
+    await run_command(
+        ["bun", "create", starter("vite"), app_name, "--template", template_with_ts],
+        cwd=project_dir,
+        interactive=interactive,
     )
 
-    # Install dependencies
-    os.chdir(app_name)
+
+async def install_bun(client_dir):
+    """Install the client dependencies using bun."""
     console.print("Running bun install...")
-    subprocess.run(["bun", "install"], check=True)
+    await run_install(["bun", "install", *bun_install_args()], cwd=client_dir)
+
 
+def configure_vite_bun(project_dir, app_name='client', shadcn=False):
+    """Add the bun scripts to package.json and configure Vite (plus the Shadcn UI path aliases), written in one batch."""
+    client_dir = os.path.join(project_dir, app_name)
     # Update package.json with bun-specific scripts
     updates = {
         "scripts": {
@@ -132,10 +113,17 @@ def setup_vite_bun(project_dir, app_name='client', template='react', use_typescr
             "preview": "bun run preview"
         }
     }
-    update_package_json(project_dir, updates, subdir=app_name)
-    configure_vite(project_dir, subdir=app_name, use_shadcn=shadcn)
-    remove_default_styles(project_dir, subdir=app_name)
+    with ConfigSession(client_dir) as config:
+        update_package_json(project_dir, updates, subdir=app_name, config=config)
+        configure_vite(project_dir, subdir=app_name, use_shadcn=shadcn, config=config)
+        remove_default_styles(project_dir, subdir=app_name, config=config)
+        if shadcn:
+            configure_shadcn_paths(client_dir, config=config)
 
-    os.chdir("..")
-    console.print("✔ Vite setup complete.")
 
+async def setup_vite_bun(project_dir, app_name='client', template='react', use_typescript=True, shadcn=False, interactive: bool = True):
+    """Setup a new Vite project using bun."""
+    await create_vite_bun(project_dir, app_name, template, use_typescript, interactive=interactive)
+    await install_bun(os.path.join(project_dir, app_name))
+    configure_vite_bun(project_dir, app_name, shadcn=shadcn)
+    console.print("✔ Vite setup complete.")
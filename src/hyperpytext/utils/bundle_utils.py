@@ -0,0 +1,234 @@
+import os
+import json
+import mmap
+import struct
+import hashlib
+import threading
+import uuid
+from functools import cache
+from pathlib import Path
+
+BUNDLE_MAGIC = b"HPYBNDL1"
+BUNDLE_HEADER = struct.Struct("<8sQ")
+
+# The templates don't change while the process runs, the bundle is looked up once
+_bundle: "TemplateBundle | None" = None
+_bundle_checked = False
+_bundle_lock = threading.Lock()
+# Parsed template groups kept in memory by long running processes (the serve daemon), see preload_templates
+_parsed: dict[str, object] | None = None
+
+def get_templates_path() -> Path:
+    """Root folder of the packaged templates, template groups are named relative to it."""
+    from importlib import resources
+
+    with resources.path('hyperpytext.templates', 'react') as path:
+        return path.parent
+
+
+def load_yaml(path: str | Path):
+    """Parse a yaml template, with the libyaml loader when PyYAML was built with it."""
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, 'rb') as file:
+        return yaml.load(file, Loader=loader)
+
+
+def _template_files(templates_path: Path) -> list[tuple[str, Path]]:
+    """Every template as (group, path), a group is the template path without the .yaml suffix: react/server/db_auth"""
+    files = []
+    for root, dirs, names in os.walk(templates_path):
+        dirs.sort()
+        for name in sorted(names):
+            if name.endswith('.yaml'):
+                path = Path(root) / name
+                files.append((path.relative_to(templates_path).as_posix()[:-len('.yaml')], path))
+    return files
+
+
+def templates_hash(templates_path: Path | None = None, files: list[tuple[str, Path]] | None = None) -> str:
+    """Content hash of every template, a bundle is only valid for the exact templates it was compiled from."""
+    if templates_path is None:
+        return _installed_templates_hash()
+    digest = hashlib.sha256()
+    for group, path in files if files is not None else _template_files(templates_path):
+        digest.update(group.encode() + b"\0")
+        digest.update(path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def templates_fingerprint(templates_path: Path, files: list[tuple[str, Path]]) -> str:
+    """
+    Hash of the package version and the path, size and mtime of every template: stat calls only, no reads.
+    Templates edited in place change it, so a fingerprint maps to a single content hash.
+    """
+    from hyperpytext import __version__
+
+    digest = hashlib.sha256(f"{__version__}\0{templates_path}\0".encode())
+    for group, path in files:
+        stat = path.stat()
+        digest.update(f"{group}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+
+def _fingerprint_path(fingerprint: str) -> Path:
+    from hyperpytext.utils.cache_utils import get_cache_dir
+    return get_cache_dir() / "templates" / f"hash-{fingerprint[:16]}"
+
+
+@cache
+def _installed_templates_hash() -> str:
+    """
+    Content hash of the installed templates, read from the cache when their fingerprint (see templates_fingerprint)
+    was already seen: the template bytes are only hashed again after an install or an edit.
+    """
+    templates_path = get_templates_path()
+    files = _template_files(templates_path)
+    fingerprint_path = _fingerprint_path(templates_fingerprint(templates_path, files))
+    try:
+        content_hash = fingerprint_path.read_text().strip()
+        if len(content_hash) == 64:
+            return content_hash
+    except OSError:
+        pass
+
+    content_hash = templates_hash(templates_path, files)
+    try:
+        os.makedirs(fingerprint_path.parent, exist_ok=True)
+        tmp_path = fingerprint_path.with_name(f".{fingerprint_path.name}.{uuid.uuid4().hex}")
+        tmp_path.write_text(content_hash)
+        os.replace(tmp_path, fingerprint_path)
+    except OSError:
+        # A read only cache only costs the hashing on every run
+        pass
+    return content_hash
+
+
+def compile_bundle(bundle_path: str | Path, templates_path: Path | None = None, content_hash: str | None = None) -> Path:
+    """
+    Compile every yaml template into a single bundle file:
+
+        header   magic + size of the index
+        index    json: {"hash": templates content hash, "groups": {group: [offset, length, sha256]}}
+        payload  each group parsed once and stored as json, at its offset from the end of the index
+
+    The file is written aside and moved in place, so concurrent runs never read a partial bundle.
+    """
+    templates_path = templates_path or get_templates_path()
+    groups, payloads, offset = {}, [], 0
+    for group, path in _template_files(templates_path):
+        payload = json.dumps(load_yaml(path), separators=(',', ':')).encode()
+        groups[group] = [offset, len(payload), hashlib.sha256(payload).hexdigest()]
+        payloads.append(payload)
+        offset += len(payload)
+
+    index = json.dumps({"hash": content_hash or templates_hash(templates_path), "groups": groups}).encode()
+    bundle_path = Path(bundle_path)
+    os.makedirs(bundle_path.parent, exist_ok=True)
+    tmp_path = bundle_path.with_name(f".{bundle_path.name}.{uuid.uuid4().hex}")
+    with open(tmp_path, 'wb') as f:
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, len(index)))
+        f.write(index)
+        for payload in payloads:
+            f.write(payload)
+    os.replace(tmp_path, bundle_path)
+    return bundle_path
+
+
+class TemplateBundle:
+    """A compiled templates bundle, memory mapped: loading a group only touches the bytes of that group."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_size = BUNDLE_HEADER.unpack_from(self._mmap, 0)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{self.path} is not a templates bundle")
+        index = json.loads(self._mmap[BUNDLE_HEADER.size:BUNDLE_HEADER.size + index_size])
+        self.hash = index["hash"]
+        self.groups = index["groups"]
+        self._data_offset = BUNDLE_HEADER.size + index_size
+
+    def __contains__(self, group: str) -> bool:
+        return group in self.groups
+
+    def load(self, group: str):
+        offset, length, checksum = self.groups[group]
+        start = self._data_offset + offset
+        payload = self._mmap[start:start + length]
+        if hashlib.sha256(payload).hexdigest() != checksum:
+            raise ValueError(f"Corrupted template group '{group}' in {self.path}")
+        return json.loads(payload)
+
+
+def bundle_path(content_hash: str) -> Path:
+    from hyperpytext.utils.cache_utils import get_cache_dir
+    return get_cache_dir() / "templates" / f"templates-{content_hash[:16]}.bundle"
+
+
+def open_bundle() -> TemplateBundle:
+    """Open the bundle for the installed templates, compiling it first if they changed since the last one."""
+    content_hash = templates_hash()
+    path = bundle_path(content_hash)
+    if not path.is_file():
+        compile_bundle(path, content_hash=content_hash)
+    bundle = TemplateBundle(path)
+    if bundle.hash != content_hash:
+        raise ValueError(f"{path} does not match the installed templates")
+    return bundle
+
+
+def get_bundle() -> TemplateBundle | None:
+    """
+    The bundle for the installed templates, compiled on the first run (or after any template changes).
+    None when it can't be built or read (read only cache, corrupted file...), callers parse the yaml instead.
+    """
+    global _bundle, _bundle_checked
+    with _bundle_lock:
+        if not _bundle_checked:
+            try:
+                _bundle = open_bundle()
+            except (OSError, ValueError, struct.error):
+                _bundle = None
+            _bundle_checked = True
+        return _bundle
+
+
+def load_template_group(group: str):
+    """
+    Load a template group, e.g. 'react/server/db_auth', from the bundle or straight from its yaml file.
+    The result is shared once the templates are preloaded, callers must not change it.
+    """
+    if _parsed is not None and group in _parsed:
+        return _parsed[group]
+    bundle = get_bundle()
+    if bundle and group in bundle:
+        try:
+            return bundle.load(group)
+        except ValueError:
+            pass
+    return load_yaml(get_templates_path() / f"{group}.yaml")
+
+
+def preload_templates() -> int:
+    """Parse every template group once and keep them in memory, for processes serving many apps. Returns the group count."""
+    global _parsed
+    parsed = {group: load_template_group(group) for group, _ in _template_files(get_templates_path())}
+    _parsed = parsed
+    return len(parsed)
+
+
+def template_group_hash(group: str) -> str:
+    """Content hash of a template group, the same whether it's read from the bundle or from its yaml file."""
+    bundle = get_bundle()
+    if bundle and group in bundle:
+        return bundle.groups[group][2]
+    payload = json.dumps(load_yaml(get_templates_path() / f"{group}.yaml"), separators=(',', ':')).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+if __name__ == "__main__":
+    content_hash = templates_hash()
+    print(f"✔ Compiled {compile_bundle(bundle_path(content_hash), content_hash=content_hash)}")
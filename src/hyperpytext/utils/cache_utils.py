@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import uuid
+from functools import cache
+from pathlib import Path
+from hyperpytext.utils.process_utils import check_system, probe_tool
+from hyperpytext.utils.templates_utils import get_template_path
+from hyperpytext.utils.console_utils import console
+
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+SNAPSHOT_META = "meta.json"
+SNAPSHOT_TREE = "tree"
+
+
+def get_cache_dir() -> Path:
+    """Root folder for the hyperpytext caches: $HYPERPY_CACHE_DIR, or hyperpytext/ under the user cache folder."""
+    if os.environ.get("HYPERPY_CACHE_DIR"):
+        return Path(os.environ["HYPERPY_CACHE_DIR"])
+    if os.environ.get("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "hyperpytext"
+    if check_system() == "windows" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "hyperpytext" / "cache"
+    return Path.home() / ".cache" / "hyperpytext"
+
+
+def get_cache_max_bytes() -> int:
+    """Size cap for the client snapshots, $HYPERPY_CACHE_MAX_BYTES or 2GiB."""
+    try:
+        return int(os.environ.get("HYPERPY_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_CACHE_MAX_BYTES
+
+
+def client_snapshots_dir() -> Path:
+    return get_cache_dir() / "clients"
+
+
+def hash_directory(path: Path) -> str:
+    """Content hash of every file under path (names and bytes)."""
+    digest = hashlib.sha256()
+    for file in sorted(path.rglob("*")):
+        if file.is_file():
+            digest.update(file.relative_to(path).as_posix().encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+@cache
+def client_templates_hash() -> str:
+    """Hash of the client templates, computed once per process: they're package data, they don't change while it runs."""
+    return hash_directory(get_template_path('react/client'))
+
+
+def client_cache_key(
+    package_manager: str,
+    template: str,
+    use_typescript: bool,
+    shadcn: bool,
+    fonts: bool,
+    tool_versions: dict[str, str],
+    starters: dict[str, str],
+) -> str:
+    """
+    Content address of a finished client tree: the options, the tool versions, the starter specs (pinned or
+    @latest, see offline_utils.starter) and the client templates.
+    """
+    payload = {
+        "package_manager": package_manager,
+        "template": template,
+        "use_typescript": use_typescript,
+        "shadcn": shadcn,
+        "fonts": fonts,
+        "tool_versions": tool_versions,
+        "starters": starters,
+        "client_templates": client_templates_hash(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def client_tool_versions(package_manager: str) -> dict[str, str]:
+    """Versions of the tools that build the client tree, part of the snapshot key."""
+    tools = ["bun"] if package_manager == "bun" else ["node", "npm"]
+    versions = {}
+    for tool in tools:
+        info = probe_tool(tool)
+        versions[tool] = info.version if info else "unknown"
+    return versions
+
+
+def has_client_snapshot(key: str) -> bool:
+    snapshot = client_snapshots_dir() / key
+    return (snapshot / SNAPSHOT_TREE).is_dir() and _read_meta(snapshot) is not None
+
+
+def _copy_function(root: Path):
+    """Hardlink the files under node_modules (falling back to a copy across filesystems), copy everything else."""
+    def copy(src, dst):
+        if "node_modules" in Path(src).relative_to(root).parts:
+            try:
+                if os.path.lexists(dst):
+                    os.remove(dst)
+                os.link(src, dst)
+                return dst
+            except OSError:
+                pass
+        return shutil.copy2(src, dst)
+    return copy
+
+
+def _copy_tree(src: Path, dst: Path):
+    shutil.copytree(src, dst, symlinks=True, copy_function=_copy_function(src), dirs_exist_ok=True)
+
+
+def _tree_size(path: Path) -> int:
+    """Disk usage of a tree, counting hardlinked files once."""
+    size, seen = 0, set()
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.lstat(os.path.join(root, name))
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                size += stat.st_size
+    return size
+
+
+def _read_meta(snapshot: Path) -> dict | None:
+    try:
+        with open(snapshot / SNAPSHOT_META, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(snapshot: Path, meta: dict):
+    tmp_path = snapshot / f".{SNAPSHOT_META}.{uuid.uuid4().hex}"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, snapshot / SNAPSHOT_META)
+
+
+def restore_client_snapshot(key: str, client_dir: str):
+    """Materialize the cached client tree for this key into client_dir, node_modules is hardlinked."""
+    snapshot = client_snapshots_dir() / key
+    meta = _read_meta(snapshot)
+    if not meta or not (snapshot / SNAPSHOT_TREE).is_dir():
+        raise FileNotFoundError(f"No cached client app for {key[:12]}")
+
+    _copy_tree(snapshot / SNAPSHOT_TREE, Path(client_dir))
+    meta["last_used"] = time.time()
+    _write_meta(snapshot, meta)
+    console.print(f"✔ Restored the client app from the cache ({key[:12]})")
+
+
+def save_client_snapshot(key: str, client_dir: str, max_bytes: int | None = None):
+    """Store a finished client tree under its key, then evict the least recently used snapshots over the size cap."""
+    snapshots_dir = client_snapshots_dir()
+    snapshot = snapshots_dir / key
+    if snapshot.exists():
+        return
+
+    # Build the snapshot aside and publish it with a rename, concurrent runs can store the same key
+    staging = snapshots_dir / f".staging-{key[:12]}-{uuid.uuid4().hex}"
+    try:
+        os.makedirs(staging)
+        _copy_tree(Path(client_dir), staging / SNAPSHOT_TREE)
+        now = time.time()
+        _write_meta(staging, {"key": key, "size": _tree_size(staging / SNAPSHOT_TREE), "created": now, "last_used": now})
+        os.rename(staging, snapshot)
+        console.print(f"✔ Saved the client app to the cache ({key[:12]})")
+    except OSError as e:
+        console.print(f"🚩 Could not save the client app to the cache: {e}")
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    evict_client_snapshots(get_cache_max_bytes() if max_bytes is None else max_bytes, keep=key)
+
+
+def evict_client_snapshots(max_bytes: int, keep: str | None = None):
+    """Remove the least recently used snapshots until the cache fits in max_bytes."""
+    snapshots_dir = client_snapshots_dir()
+    if not snapshots_dir.is_dir():
+        return
+
+    snapshots = []
+    for snapshot in snapshots_dir.iterdir():
+        meta = _read_meta(snapshot) if snapshot.is_dir() and not snapshot.name.startswith(".") else None
+        if meta:
+            snapshots.append((meta.get("last_used", 0), meta.get("size", 0), snapshot))
+
+    total = sum(size for _, size, _ in snapshots)
+    for _, size, snapshot in sorted(snapshots, key=lambda item: item[0]):
+        if total <= max_bytes:
+            break
+        if snapshot.name == keep:
+            continue
+        shutil.rmtree(snapshot, ignore_errors=True)
+        total -= size
+        console.print(f"✔ Evicted cached client app {snapshot.name[:12]}")
@@ -0,0 +1,144 @@
+import os
+import json
+import contextlib
+from hyperpytext.utils.writer_utils import write_tree
+
+def deep_merge(base: dict, updates: dict) -> dict:
+    """A copy of base with updates merged in: nested dicts are merged key by key at any depth, anything else is replaced."""
+    merged = dict(base)
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def dump_json(data: dict) -> str:
+    return json.dumps(data, indent=2)
+
+
+class ConfigSession:
+    """
+    The config files of a project (package.json, tsconfig.json, vite.config.ts...) edited in memory.
+
+    Each file is read once, on first use, json files are parsed once too. Edits apply to the in memory
+    copy, flush writes every file whose content changed in one batch (see writer_utils.write_tree) and
+    leaves the others alone, so re-applying the same config (a resumed run) writes nothing.
+    Used as a context manager it flushes when the block succeeds, a failing block writes nothing:
+
+        with ConfigSession(client_dir) as config:
+            config.merge_json("package.json", {"scripts": {"dev": "vite"}})
+            config.write_text("vite.config.ts", vite_config)
+    """
+
+    def __init__(self, root: str, fsync: str = "none"):
+        self.root = root
+        self.fsync = fsync
+        self._loaded: dict[str, str | None] = {}  # content on disk, None for missing files
+        self._content: dict[str, str | dict | None] = {}  # current content, text or parsed json
+        self._removed: set[str] = set()
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.root, filename)
+
+    def relpath(self, path: str) -> str:
+        """Session filename of a path, for helpers that take the project folder."""
+        return os.path.relpath(path, self.root)
+
+    def _load(self, filename: str) -> str | None:
+        if filename not in self._loaded:
+            try:
+                with open(self.path(filename), 'r') as f:
+                    self._loaded[filename] = f.read()
+            except FileNotFoundError:
+                self._loaded[filename] = None
+            self._content[filename] = self._loaded[filename]
+        return self._content[filename]
+
+    def exists(self, filename: str) -> bool:
+        return self._load(filename) is not None
+
+    def read_text(self, filename: str) -> str | None:
+        content = self._load(filename)
+        return dump_json(content) if isinstance(content, dict) else content
+
+    def read_json(self, filename: str) -> dict | None:
+        """The parsed file, None when it doesn't exist. The returned dict is the session copy, changes to it are flushed."""
+        content = self._load(filename)
+        if isinstance(content, str):
+            content = self._content[filename] = json.loads(content)
+        return content
+
+    def write_text(self, filename: str, text: str):
+        self._load(filename)
+        self._content[filename] = text
+        self._removed.discard(filename)
+
+    def write_json(self, filename: str, data: dict):
+        self._load(filename)
+        self._content[filename] = data
+        self._removed.discard(filename)
+
+    def merge_json(self, filename: str, updates: dict) -> bool:
+        """Deep merge updates into a json file (see deep_merge), False when the file doesn't exist."""
+        data = self.read_json(filename)
+        if data is None:
+            return False
+        self._content[filename] = deep_merge(data, updates)
+        return True
+
+    def remove(self, filename: str) -> bool:
+        """Delete a file on flush, False when it doesn't exist."""
+        if not self.exists(filename):
+            return False
+        self._content[filename] = None
+        self._removed.add(filename)
+        return True
+
+    def _changed(self, filename: str) -> bool:
+        content, loaded = self._content[filename], self._loaded[filename]
+        if isinstance(content, dict) and loaded is not None:
+            # Compared as data: a json file that was only read isn't rewritten with a different formatting
+            try:
+                return content != json.loads(loaded)
+            except ValueError:
+                return True
+        return content != loaded
+
+    def changed(self) -> list[str]:
+        """The files flush would write or delete."""
+        return sorted(filename for filename in self._content if self._changed(filename))
+
+    def flush(self) -> list[str]:
+        """Write the changed files at once and delete the removed ones, returns the changed files."""
+        changed = self.changed()
+        writes = [(filename, self.read_text(filename)) for filename in changed if filename not in self._removed]
+        if writes:
+            write_tree(writes, self.root, fsync=self.fsync)
+        for filename in changed:
+            if filename in self._removed:
+                os.remove(self.path(filename))
+            self._loaded[filename] = self.read_text(filename)
+        self._removed.clear()
+        return changed
+
+    def __enter__(self) -> "ConfigSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+
+@contextlib.contextmanager
+def config_session(directory: str, config: ConfigSession | None = None):
+    """
+    The session of a config helper: the caller's session when given (flushed by the caller along
+    with its other edits), otherwise a session over directory flushed at the end of the block.
+    """
+    if config is not None:
+        yield config
+        return
+    with ConfigSession(directory) as config:
+        yield config
@@ -0,0 +1,20 @@
+class LazyConsole:
+    """
+    The rich console shared by the cli and every util module.
+    rich is only imported the first time something is printed, importing a module stays cheap.
+    """
+
+    def __init__(self):
+        self._console = None
+
+    def get(self):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+console = LazyConsole()
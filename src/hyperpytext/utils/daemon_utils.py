@@ -0,0 +1,294 @@
+import os
+import json
+import stat
+import signal
+import time
+import asyncio
+import contextlib
+from collections.abc import Callable
+from hyperpytext.utils.console_utils import console
+from hyperpytext.utils.options_utils import MAX_CONCURRENCY, PACKAGE_MANAGERS, AppOptions
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+MAX_REQUEST_BYTES = 64 * 1024
+REQUEST_FIELDS = ("app_name", "output_dir", "resume")
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+}
+
+class HttpError(Exception):
+    """A request the daemon refuses, answered with status and a json {"error": message} body."""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+    """Read a plain HTTP/1.1 request: the method, the path (without the query) and the body."""
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    try:
+        method, target, _ = request_line.split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Malformed request line") from None
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length") from None
+    if length > MAX_REQUEST_BYTES:
+        raise HttpError(413, f"Requests are limited to {MAX_REQUEST_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], body
+
+
+def start_response(writer: asyncio.StreamWriter, status: int, content_type: str, length: int | None = None):
+    """Write the status line and headers, without a length the body runs until the connection closes (streaming)."""
+    headers = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", f"Content-Type: {content_type}", "Connection: close"]
+    if length is not None:
+        headers.append(f"Content-Length: {length}")
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+
+
+async def send_json(writer: asyncio.StreamWriter, status: int, data: dict):
+    body = json.dumps(data).encode()
+    start_response(writer, status, "application/json", len(body))
+    writer.write(body)
+    await writer.drain()
+
+
+class ScaffoldDaemon:
+    """
+    Creates apps on request, from a long running process that keeps the parsed templates, the tool
+    probes and the client snapshot keys in memory (see warm_up): a request only pays for its own steps.
+
+    Speaks plain HTTP, over a unix socket or a localhost port (see serve):
+
+        GET  /health    daemon status and counters, json
+        POST /scaffold  {"app_name": "tenant_a", "piccolo_auth": true, "package_manager": "npm", ...}
+
+    A scaffold request takes the options of a batch spec entry (see scaffold_utils.app_options), plus an
+    optional output_dir (relative to the daemon output folder) and resume. Its response streams the
+    progress as json lines (application/x-ndjson) until the app is done:
+
+        {"event": "accepted", "app_name": "tenant_a", "app_dir": "/apps/tenant_a"}
+        {"event": "step", "step": "uv_sync", "status": "started"}
+        {"event": "step", "step": "uv_sync", "status": "done", "duration": 0.412}
+        {"event": "done", "app_dir": "/apps/tenant_a", "duration": 1.234}
+
+    or {"event": "error", "error": "...", "step": "..."} when it fails. Up to jobs apps are created at
+    the same time, the others wait for a slot. Every app gets explicit paths, the working directory
+    of the daemon never changes, and two requests can't create the same app at once.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        jobs: int = 4,
+        max_concurrency: int | None = MAX_CONCURRENCY,
+        use_cache: bool = True,
+        fsync: str = "none",
+    ):
+        self.output_dir = os.path.abspath(output_dir)
+        self.jobs = jobs
+        self.max_concurrency = max_concurrency
+        self.use_cache = use_cache
+        self.fsync = fsync
+        self.started_at = time.time()
+        self.running: set[str] = set()
+        self.created = 0
+        self.failed = 0
+        self._slots: asyncio.Semaphore | None = None
+
+    def warm_up(self) -> dict:
+        """Load everything a request would otherwise load on its own: templates, tool probes, client template hash."""
+        from hyperpytext.utils.bundle_utils import get_bundle, preload_templates, templates_hash
+        from hyperpytext.utils.cache_utils import client_templates_hash
+        from hyperpytext.utils.process_utils import probe_tool
+        import hyperpytext.utils.scaffold_utils  # noqa: F401, the step helpers and their imports
+
+        get_bundle()
+        groups = preload_templates()
+        templates_hash()
+        client_templates_hash()
+        tools = {tool: info.version if (info := probe_tool(tool)) else None for tool in ["uv", "node", *PACKAGE_MANAGERS]}
+        return {"templates": groups, "tools": tools}
+
+    def status(self) -> dict:
+        from hyperpytext.utils.process_utils import process_stats
+
+        stats = process_stats()
+        return {
+            "status": "ok",
+            "uptime": round(time.time() - self.started_at, 1),
+            "output_dir": self.output_dir,
+            "running": sorted(self.running),
+            "created": self.created,
+            "failed": self.failed,
+            "processes": {"spawns": stats.spawns, "child_time": round(stats.child_time, 3), "retries": stats.retries, "timeouts": stats.timeouts},
+        }
+
+    def request_output_dir(self, output_dir) -> str:
+        """The folder a request scaffolds into, its output_dir must stay inside the daemon output folder."""
+        if (
+            not isinstance(output_dir, str)
+            or os.path.isabs(output_dir)
+            or ".." in output_dir.replace("\\", "/").split("/")
+        ):
+            raise HttpError(400, "output_dir must be a relative folder inside the daemon output folder")
+        # Resolved, so a symlink inside the output folder can't lead out of it either
+        root = os.path.realpath(self.output_dir)
+        path = os.path.realpath(os.path.join(root, output_dir))
+        if os.path.commonpath([root, path]) != root:
+            raise HttpError(400, "output_dir must be a relative folder inside the daemon output folder")
+        return path
+
+    def parse_request(self, body: bytes) -> tuple[str, str, AppOptions, bool]:
+        """The app name, folder, options and resume flag of a scaffold request."""
+        from hyperpytext.utils.process_utils import probe_tool
+        from hyperpytext.utils.scaffold_utils import app_options, check_app_name
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HttpError(400, f"Invalid json: {e}") from None
+        if not isinstance(request, dict) or not isinstance(request.get("app_name"), str):
+            raise HttpError(400, "The request needs an app_name")
+
+        app_name = request["app_name"]
+        try:
+            check_app_name(app_name)
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+        output_dir = self.request_output_dir(request.get("output_dir") or ".")
+        resume = request.get("resume", False)
+        if not isinstance(resume, bool):
+            raise HttpError(400, "resume must be true or false")
+        try:
+            options = app_options(app_name, {key: value for key, value in request.items() if key not in REQUEST_FIELDS})
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+
+        missing = [tool for tool in ("uv", options.package_manager) if probe_tool(tool) is None]
+        if missing:
+            raise HttpError(400, f"{', '.join(missing)} not found in PATH")
+        return app_name, os.path.abspath(os.path.join(output_dir, app_name)), options, resume
+
+    async def scaffold(self, writer: asyncio.StreamWriter, body: bytes):
+        from hyperpytext.utils.dag_utils import StepFailedError
+        from hyperpytext.utils.scaffold_utils import scaffold_app_async
+
+        app_name, app_dir, options, resume = self.parse_request(body)
+        if app_dir in self.running:
+            raise HttpError(409, f"{app_dir} is being created by another request")
+
+        def emit(event: dict):
+            # A client that went away doesn't stop the app, the events are just dropped
+            if not writer.is_closing():
+                writer.write(json.dumps(event).encode() + b"\n")
+
+        self.running.add(app_dir)
+        try:
+            start_response(writer, 200, "application/x-ndjson")
+            emit({"event": "accepted", "app_name": app_name, "app_dir": app_dir})
+            await writer.drain()
+            async with self._slots:
+                start = time.perf_counter()
+                try:
+                    await scaffold_app_async(
+                        app_dir,
+                        options,
+                        interactive=False,
+                        max_concurrency=self.max_concurrency,
+                        use_cache=self.use_cache,
+                        fsync=self.fsync,
+                        resume=resume,
+                        on_event=emit,
+                    )
+                except StepFailedError as e:
+                    self.failed += 1
+                    emit({"event": "error", "step": e.step, "error": str(e.error) or type(e.error).__name__})
+                    console.print(f"🚩 Failed to create '{app_name}': {e}")
+                except Exception as e:
+                    self.failed += 1
+                    emit({"event": "error", "error": str(e) or type(e).__name__})
+                    console.print(f"🚩 Failed to create '{app_name}': {e}")
+                else:
+                    duration = time.perf_counter() - start
+                    self.created += 1
+                    emit({"event": "done", "app_dir": app_dir, "duration": round(duration, 3)})
+                    console.print(f"✔ Created '{app_name}' in {duration:.1f}s")
+        finally:
+            self.running.discard(app_dir)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer a single request per connection."""
+        try:
+            method, path, body = await read_request(reader)
+            if path == "/health":
+                if method != "GET":
+                    raise HttpError(405, "Use GET /health")
+                await send_json(writer, 200, self.status())
+            elif path == "/scaffold":
+                if method != "POST":
+                    raise HttpError(405, "Use POST /scaffold")
+                await self.scaffold(writer, body)
+            else:
+                raise HttpError(404, f"No route for {path}, use GET /health or POST /scaffold")
+            await writer.drain()
+        except HttpError as e:
+            with contextlib.suppress(ConnectionError):
+                await send_json(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def serve(
+        self,
+        socket_path: str | None = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        ready: Callable[[asyncio.Server], None] | None = None,
+    ):
+        """
+        Serve requests on a unix socket when socket_path is given, else on host:port, ready gets the listening server.
+        SIGINT/SIGTERM stop accepting requests, the apps being created finish first.
+        """
+        self._slots = asyncio.Semaphore(self.jobs)
+        if socket_path:
+            # A socket left behind by a daemon that didn't stop cleanly
+            if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            # No signal handlers on windows, ctrl+c interrupts the loop there
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(signum, stop.set)
+        try:
+            async with server:
+                if ready:
+                    ready(server)
+                await stop.wait()
+                server.close()
+                console.print(f"Stopping, waiting for {len(self.running)} apps being created...")
+        finally:
+            if socket_path:
+                with contextlib.suppress(OSError):
+                    os.remove(socket_path)
@@ -0,0 +1,129 @@
+import time
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from collections.abc import Awaitable, Callable
+from graphlib import CycleError, TopologicalSorter
+from hyperpytext.utils.console_utils import console
+from hyperpytext.utils.profile_utils import profile_row, span
+
+@dataclass(frozen=True)
+class Step:
+    """
+    A unit of work of the scaffold graph.
+
+    Args:
+        name: Unique step name, used by other steps to depend on it
+        action: Zero argument callable returning an awaitable (e.g. a functools.partial of an async function)
+        deps: Names of the steps that must finish before this one starts
+        inputs: Hash of everything the step depends on, a journal reruns it when it changes
+        outputs: Paths the step creates, relative to the app folder, a journal reruns it when one is missing
+    """
+    name: str
+    action: Callable[[], Awaitable]
+    deps: tuple[str, ...] = ()
+    inputs: str = ""
+    outputs: tuple[str, ...] = ()
+
+
+class StepFailedError(Exception):
+    """Raised by run_steps with the first step that failed, the original error is the cause."""
+    def __init__(self, step: str, error: BaseException):
+        super().__init__(f"Step '{step}' failed: {error}")
+        self.step = step
+        self.error = error
+
+
+def in_thread(func: Callable, *args, **kwargs) -> Callable[[], Awaitable]:
+    """Wrap a blocking function as a step action, it will run on a worker thread."""
+    return lambda: asyncio.to_thread(func, *args, **kwargs)
+
+
+def check_steps(steps: list[Step]) -> list[str]:
+    """Validate the graph and return the step names in a valid execution order."""
+    names = {step.name for step in steps}
+    if len(names) != len(steps):
+        raise ValueError("Step names must be unique")
+    for step in steps:
+        missing = set(step.deps) - names
+        if missing:
+            raise ValueError(f"Step '{step.name}' depends on unknown steps: {', '.join(sorted(missing))}")
+    try:
+        return list(TopologicalSorter({step.name: step.deps for step in steps}).static_order())
+    except CycleError as e:
+        raise ValueError(f"Steps have a dependency cycle: {' -> '.join(e.args[1])}") from None
+
+
+async def run_steps(
+    steps: list[Step],
+    max_concurrency: int | None = None,
+    journal=None,
+    on_event: Callable[[dict], None] | None = None,
+):
+    """
+    Run the steps as a dependency graph: every step starts as soon as all its deps are done,
+    so independent branches run at the same time.
+
+    Args:
+        steps: The steps to run
+        max_concurrency: Maximum number of steps running at once, None for no limit
+        journal: Optional StepJournal (see journal_utils), completed steps are recorded on it and the
+            ones it reports as done are skipped, as long as every step they depend on was skipped too
+        on_event: Optional callback for progress reports, called on the event loop with
+            {"event": "step", "step": name, "status": "started" | "done" | "skipped" | "failed", "duration": seconds}
+
+    If a step fails every other running step is cancelled (child processes included) and a
+    StepFailedError is raised for the failed step.
+    When profiling (see profile_utils) every step gets a span on its own trace row.
+    """
+    order = check_steps(steps)
+    by_name = {step.name: step for step in steps}
+    limiter = asyncio.Semaphore(max_concurrency) if max_concurrency else contextlib.nullcontext()
+    tasks: dict[str, asyncio.Task] = {}
+
+    def report(step: Step, status: str, duration: float | None = None):
+        if on_event:
+            event = {"event": "step", "step": step.name, "status": status}
+            if duration is not None:
+                event["duration"] = round(duration, 3)
+            on_event(event)
+
+    async def run(step: Step, row: int) -> bool:
+        """Returns True when the step was skipped."""
+        deps = [tasks[dep] for dep in step.deps]
+        if deps:
+            await asyncio.wait(deps)
+            # A dependency failed, the task group is already cancelling everything
+            if any(dep.cancelled() or dep.exception() for dep in deps):
+                return False
+
+        # A step that reran can change what the next ones built on (a new package.json...)
+        if journal and all(dep.result() for dep in deps) and journal.is_done(step):
+            console.print(f"✔ Skipped {step.name}, done on a previous run")
+            report(step, "skipped")
+            return True
+
+        async with limiter:
+            if journal:
+                journal.start(step)
+            profile_row(row, step.name)
+            report(step, "started")
+            start = time.perf_counter()
+            try:
+                with span(step.name, "step"):
+                    await step.action()
+            except Exception as e:
+                report(step, "failed", time.perf_counter() - start)
+                raise StepFailedError(step.name, e) from e
+            if journal:
+                journal.record(step)
+            report(step, "done", time.perf_counter() - start)
+        return False
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for row, name in enumerate(order, start=1):
+                tasks[name] = group.create_task(run(by_name[name], row), name=name)
+    except ExceptionGroup as failures:
+        error = failures.exceptions[0]
+        raise error from error.__cause__
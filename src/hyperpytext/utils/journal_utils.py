@@ -0,0 +1,70 @@
+import os
+import json
+import uuid
+import hashlib
+from datetime import datetime
+from hyperpytext.utils.dag_utils import Step
+
+JOURNAL_DIR = ".hyperpy"
+JOURNAL_FILE = "journal.json"
+
+def inputs_hash(*inputs) -> str:
+    """Hash of everything a step depends on (options, dependencies, template hashes...), as plain json values."""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class StepJournal:
+    """
+    Record of the completed steps of an app, in <app_dir>/.hyperpy/journal.json:
+
+        {"options": {...}, "created_at": "...", "steps": {"uv_sync": {"inputs": "<hash>", "completed_at": "..."}}}
+
+    Every run records its steps. With resume=True a step is skipped when it completed on a previous run
+    with the same inputs and its outputs (paths relative to app_dir) still exist. Steps without outputs
+    always run. The journal is saved after every change, a crash loses at most the running steps.
+    created_at is kept across resumed runs, so what's derived from it (migration ids) doesn't change.
+    """
+
+    def __init__(self, app_dir: str, options: dict | None = None, resume: bool = False):
+        self.path = os.path.join(app_dir, JOURNAL_DIR, JOURNAL_FILE)
+        self.app_dir = app_dir
+        self.resume = resume
+        previous = self.load(app_dir) if resume else {}
+        self.options = options if options is not None else previous.get("options", {})
+        self.created_at: str = previous.get("created_at") or datetime.now().isoformat()
+        self.steps: dict[str, dict] = previous.get("steps", {})
+
+    @staticmethod
+    def load(app_dir: str) -> dict:
+        """The saved journal of an app, empty when there's none (or it can't be read)."""
+        try:
+            with open(os.path.join(app_dir, JOURNAL_DIR, JOURNAL_FILE), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_done(self, step: Step) -> bool:
+        if not self.resume or not step.outputs:
+            return False
+        entry = self.steps.get(step.name)
+        return (
+            entry is not None
+            and entry.get("inputs") == step.inputs
+            and all(os.path.exists(os.path.join(self.app_dir, output)) for output in step.outputs)
+        )
+
+    def start(self, step: Step):
+        """Forget a step before running it, if it fails halfway it won't count as done."""
+        if self.steps.pop(step.name, None) is not None:
+            self.save()
+
+    def record(self, step: Step):
+        self.steps[step.name] = {"inputs": step.inputs, "completed_at": datetime.now().isoformat()}
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}"
+        with open(tmp_path, "w") as f:
+            json.dump({"options": self.options, "created_at": self.created_at, "steps": self.steps}, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -1,9 +1,7 @@
-import os
-import subprocess
-from rich.console import Console
-from .npm_utils import check_system, check_npm_package, update_package_json
+from .npm_utils import check_npm_package, update_package_json
+from .process_utils import run_command, run_install, tool_command
+from .console_utils import console
 
-console = Console()
 
 def update_package_json_for_electron(project_dir, app_name):
     updates = {
@@ -16,13 +14,12 @@ def update_package_json_for_electron(project_dir, app_name):
     update_package_json(project_dir, updates)
 
 
-def setup_electron_npm(project_dir, app_name):
-    os.chdir(project_dir)
-    npm_ = "npm.cmd" if check_system() == "windows" else "npm"
-    if not check_npm_package('electron'):
+async def setup_electron_npm(project_dir, app_name):
+    npm_ = tool_command("npm")
+    if not check_npm_package('electron', project_dir):
         console.print("Installing Electron...")
-        subprocess.run([npm_, "init", "-y"], check=True)
-        subprocess.run([npm_, "install", "--save-dev", "electron@latest"], check=True)
+        await run_command([npm_, "init", "-y"], cwd=project_dir)
+        await run_install([npm_, "install", "--save-dev", "electron@latest"], cwd=project_dir)
 
     update_package_json_for_electron(project_dir, app_name)
 
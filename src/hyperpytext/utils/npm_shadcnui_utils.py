@@ -1,36 +1,36 @@
 import os
-import json
 import subprocess
-from rich.console import Console
-from .npm_utils import check_system
+from .config_utils import ConfigSession, config_session
+from .offline_utils import starter
+from .process_utils import run_command, run_install, tool_command
+from .console_utils import console
 
-console = Console()
 
-def update_tsconfig_json(project_dir):
-    tsconfig_path = os.path.join(project_dir, 'tsconfig.json')
-    if os.path.exists(tsconfig_path):
-        with open(tsconfig_path, 'r') as f:
-            tsconfig = json.load(f)
-
-        if 'compilerOptions' not in tsconfig:
-            tsconfig['compilerOptions'] = {}
-
-        tsconfig['compilerOptions']['baseUrl'] = '.'
-        tsconfig['compilerOptions']['paths'] = {
-            "@/*": ["./src/*"]
-        }
-
-        with open(tsconfig_path, 'w') as f:
-            json.dump(tsconfig, f, indent=2)
+def update_tsconfig_json(project_dir, config: ConfigSession | None = None):
+    with config_session(project_dir, config) as session:
+        tsconfig_path = session.relpath(os.path.join(project_dir, 'tsconfig.json'))
+        updated = session.merge_json(tsconfig_path, {
+            'compilerOptions': {
+                'baseUrl': '.',
+                'paths': {
+                    "@/*": ["./src/*"]
+                }
+            }
+        })
 
+    if updated:
         console.print("✔ Updated tsconfig.json with baseUrl and paths for Shadcn UI.")
     else:
         console.print("🚩 tsconfig.json not found. Skipping update.")
 
 
-def update_tsconfig_app_json(project_dir):
-    tsconfig_app_path = os.path.join(project_dir, 'tsconfig.app.json')
-    if os.path.exists(tsconfig_app_path):
+def update_tsconfig_app_json(project_dir, config: ConfigSession | None = None):
+    with config_session(project_dir, config) as session:
+        tsconfig_app_path = session.relpath(os.path.join(project_dir, 'tsconfig.app.json'))
+        if not session.exists(tsconfig_app_path):
+            console.print("🚩 tsconfig.app.json not found. Skipping update.")
+            return
+
         new_config = {
             "compilerOptions": {
                 "tsBuildInfoFile": "./node_modules/.tmp/tsconfig.app.tsbuildinfo",
@@ -57,35 +57,40 @@ def update_tsconfig_app_json(project_dir):
             },
             "include": ["src"]
         }
+        session.write_json(tsconfig_app_path, new_config)
 
-        with open(tsconfig_app_path, 'w') as f:
-            json.dump(new_config, f, indent=2)
+    console.print("✔ Updated tsconfig.app.json with baseUrl and paths for Shadcn UI.")
 
-        console.print("✔ Updated tsconfig.app.json with baseUrl and paths for Shadcn UI.")
-    else:
-        console.print("🚩 tsconfig.app.json not found. Skipping update.")
+
+def configure_shadcn_paths(project_dir, config: ConfigSession | None = None):
+    """Add the @/ path alias Shadcn UI components import from to both tsconfig files."""
+    with config_session(project_dir, config) as session:
+        update_tsconfig_json(project_dir, config=session)
+        update_tsconfig_app_json(project_dir, config=session)
 
 
-def install_types_node(project_dir):
-    os.chdir(project_dir)
-    npm_ = "npm.cmd" if check_system() == "windows" else "npm"
+async def install_types_node(project_dir):
+    npm_ = tool_command("npm")
     try:
-        subprocess.run([npm_, "install", "-D", "@types/node"], check=True)
+        await run_install([npm_, "install", "-D", "@types/node"], cwd=project_dir)
         console.print("✔ Installed @types/node successfully.")
     except subprocess.CalledProcessError:
         console.print("🚩 Failed to install @types/node. Please check your npm installation.")
+        raise
 
 
-def setup_shadcn_npm(project_dir):
-    update_tsconfig_json(project_dir)
-    update_tsconfig_app_json(project_dir)
-    install_types_node(project_dir)
-    os.chdir(project_dir)
-    npx_ = "npx.cmd" if check_system() == "windows" else "npx"
+async def setup_shadcn_npm(project_dir, interactive: bool = True):
+    """Setup Shadcn UI using npm, the tsconfig path aliases are set with the vite config (see configure_vite_npm)."""
+    await install_types_node(project_dir)
+    npx_ = tool_command("npx")
     console.print("Initializing Shadcn UI...")
+    init_cmd = [npx_, starter("shadcn"), "init"]
+    if not interactive:
+        init_cmd += ["--defaults", "--yes"]
     try:
-        subprocess.run([npx_, "shadcn@latest", "init"], check=True)
+        await run_command(init_cmd, cwd=project_dir, interactive=interactive)
     except subprocess.CalledProcessError:
         console.print(
             "🚩 Failed to initialize Shadcn UI. Please check your npm installation and try again."
         )
+        raise
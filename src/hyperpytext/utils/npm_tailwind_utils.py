@@ -1,9 +1,8 @@
-import os
 import subprocess
-from rich.console import Console
-from .npm_utils import check_system, update_package_json
+from .npm_utils import update_package_json
+from .process_utils import run_install, tool_command
+from .console_utils import console
 
-console = Console()
 
 def update_package_json_for_tailwind(project_dir):
     updates = {
@@ -15,23 +14,24 @@ def update_package_json_for_tailwind(project_dir):
     }
     update_package_json(project_dir, updates)
 
-def setup_tailwind_npm(project_dir, fonts:bool = False):
-    os.chdir(project_dir)
-    npm_ = "npm.cmd" if check_system() == "windows" else "npm"
+async def setup_tailwind_npm(project_dir, fonts:bool = False):
+    npm_ = tool_command("npm")
 
     # Install tailwind and vite plugin
     console.print("Installing Tailwind CSS and Vite plugin...")
-    subprocess.run(
+    await run_install(
         [npm_, "install", "tailwindcss", "@tailwindcss/vite"],
-        check=True
+        cwd=project_dir
     )
 
-    # Install Geist fonts if specified
+    # Install Geist fonts if specified, the client falls back to system fonts without them
     if fonts:
         console.print(f"Installing Geist Fonts...")
-        subprocess.run([npm_, "install", "-D", "geist"], check=True)
-
-    update_package_json_for_tailwind(project_dir)
+        try:
+            await run_install([npm_, "install", "-D", "geist"], cwd=project_dir)
+        except subprocess.CalledProcessError as e:
+            console.print("🚩 Failed to install Geist fonts. Falling back to system fonts.")
+            console.print(f"Error: {e}")
 
 def update_tailwind_config(filename, plugins, fonts):
     with open(filename, 'r') as f:
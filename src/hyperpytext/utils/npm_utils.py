@@ -1,36 +1,16 @@
 import os
-import sys
 import json
-import subprocess
-from rich.console import Console
-
-console = Console()
-
-def check_system():
-    if sys.platform.startswith('win'):
-        return "windows"
-    elif sys.platform.startswith('darwin'):
-        return "mac"
-    elif sys.platform.startswith('linux'):
-        return "linux"
+from hyperpytext.utils.config_utils import ConfigSession, config_session
+from hyperpytext.utils.process_utils import probe_tool
+from hyperpytext.utils.console_utils import console
 
 
 def check_npm(verbose=False):
-    npm_ = "npm.cmd" if check_system() == "windows" else "npm"
-    try:
-        result = subprocess.run([npm_, "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if verbose:
-            console.print(f"npm version: {result.stdout.strip()}")
-        return True
-    except subprocess.CalledProcessError as e:
-        if verbose:
-            console.print(f"Error running npm: {e}")
-            console.print(f"Stderr: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        if verbose:
-            console.print("🚩 npm command not found in PATH...")
-        return False
+    """Check if npm is installed and available in the system, the probe is cached (see process_utils.probe_tool)."""
+    npm = probe_tool("npm")
+    if verbose:
+        console.print(f"npm version: {npm.version}" if npm else "🚩 npm command not found in PATH...")
+    return npm is not None
 
 
 def npm_install_instructions():
@@ -44,8 +24,8 @@ def npm_install_instructions():
     console.print("Once npm is installed, please run this script again.")
 
 
-def check_npm_package(package):
-    package_json_ = os.path.join(os.getcwd(), 'package.json')
+def check_npm_package(package, project_dir):
+    package_json_ = os.path.join(project_dir, 'package.json')
     if os.path.exists(package_json_):
         with open(package_json_, 'r') as file:
             package_json = json.load(file)
@@ -56,32 +36,21 @@ def check_npm_package(package):
     return False
 
 
-def update_package_json(project_dir, updates, subdir=None):
+def update_package_json(project_dir, updates, subdir=None, config: ConfigSession | None = None):
     """
     Universal package.json updater
 
     Args:
         project_dir: Base project directory
-        updates: Dict containing updates to merge into package.json
+        updates: Dict containing updates to deep merge into package.json (see config_utils.deep_merge)
         subdir: Optional subdirectory (from root) where package.json is located (e.g., 'client')
+        config: Optional ConfigSession the change is added to, written when the session is flushed
     """
     target_dir = os.path.join(project_dir, subdir) if subdir else project_dir
-    package_path = os.path.join(target_dir, 'package.json')
-
-    if os.path.exists(package_path):
-        with open(package_path, 'r') as f:
-            package = json.load(f)
-
-        # Deep merge the updates
-        for key, value in updates.items():
-            if isinstance(value, dict) and key in package:
-                package[key].update(value)
-            else:
-                package[key] = value
-
-        with open(package_path, 'w') as f:
-            json.dump(package, f, indent=2)
+    with config_session(target_dir, config) as session:
+        updated = session.merge_json(session.relpath(os.path.join(target_dir, 'package.json')), updates)
 
+    if updated:
         console.print(f"✔ Updated package.json in {target_dir}")
     else:
         console.print(f"🚩 package.json not found in {target_dir}. Skipping update.")
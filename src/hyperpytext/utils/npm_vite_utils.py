@@ -1,10 +1,11 @@
 import os
-from re import sub
-import subprocess
-from rich.console import Console
-from .npm_utils import check_system, check_npm_package, update_package_json
+from .npm_utils import check_npm_package, update_package_json
+from .npm_shadcnui_utils import configure_shadcn_paths
+from .config_utils import ConfigSession, config_session
+from .offline_utils import starter
+from .process_utils import run_command, run_install, tool_command
+from .console_utils import console
 
-console = Console()
 
 def update_package_json_for_vite(project_dir):
     updates = {
@@ -16,7 +17,7 @@ def update_package_json_for_vite(project_dir):
     }
     update_package_json(project_dir, updates)
 
-def configure_vite(project_dir: str, *, subdir: str | None = None, use_shadcn: bool = False):
+def configure_vite(project_dir: str, *, subdir: str | None = None, use_shadcn: bool = False, config: ConfigSession | None = None):
     """
     Configure Vite with all necessary plugins and settings.
 
@@ -24,6 +25,7 @@ def configure_vite(project_dir: str, *, subdir: str | None = None, use_shadcn: b
         project_dir: The project directory
         subdir: The frontend directory, where vite.config.ts should be created/updated
         use_shadcn: Whether to include Shadcn UI configuration (includes path aliases)
+        config: Optional ConfigSession the config is added to, written when the session is flushed
 
     Notes on the last step:
     We configure Vite's development server proxy settings to forward API requests to the FastAPI backend.
@@ -81,50 +83,64 @@ export default defineConfig({{
 }})
 """
 
-    with open(vite_config_path, 'w') as f:
-        f.write(vite_config)
+    with config_session(target_dir, config) as session:
+        session.write_text(session.relpath(vite_config_path), vite_config)
 
     console.print("✔ Updated Vite configuration.")
 
-def remove_default_styles(project_dir, subdir: str | None):
+def remove_default_styles(project_dir, subdir: str | None, config: ConfigSession | None = None):
     """Remove default style files created by Vite."""
     target_dir = os.path.join(project_dir, subdir) if subdir else project_dir
     app_css_path = os.path.join(target_dir, 'src', 'App.css')
 
-    if os.path.exists(app_css_path):
-        os.remove(app_css_path)
+    with config_session(target_dir, config) as session:
+        removed = session.remove(session.relpath(app_css_path))
+    if removed:
         console.print("✔ Removed default App.css file.")
 
 
-def setup_vite_npm(project_dir, app_name = 'client', template='react', use_typescript=True, shadcn=False):
-    """Setup a new Vite project using npm."""
-    os.chdir(project_dir)
-    npm_ = "npm.cmd" if check_system() == "windows" else "npm"
-    if not check_npm_package('vite'):
-        console.print("Setting up Vite...")
-        template_with_ts = f"{template}-ts" if use_typescript else template
-        subprocess.run(
-            [npm_, "create", "vite@latest", app_name, "--", "--template", template_with_ts],
-            check=True
-        )
-
-        # Install dependencies
-        os.chdir(app_name)
-        console.print("Running npm install...")
-        subprocess.run([npm_, "install"], check=True)
-
-        # Update package.json with npm-specific scripts
-        updates = {
-            'scripts': {
-                'dev': 'vite',
-                'build': 'vite build',
-                'preview': 'vite preview'
-            }
+async def create_vite_npm(project_dir, app_name = 'client', template='react', use_typescript=True, interactive: bool = True):
+    """Create the Vite project files using npm."""
+    npm_ = tool_command("npm")
+    console.print("Setting up Vite...")
+    template_with_ts = f"{template}-ts" if use_typescript else template
+    await run_command(
+        [npm_, "create", starter("vite"), app_name, "--", "--template", template_with_ts],
+        cwd=project_dir,
+        interactive=interactive,
+    )
+
+
+async def install_npm(client_dir):
+    """Install the client dependencies using npm."""
+    npm_ = tool_command("npm")
+    console.print("Running npm install...")
+    await run_install([npm_, "install"], cwd=client_dir)
+
+
+def configure_vite_npm(project_dir, app_name = 'client', shadcn=False):
+    """Add the npm scripts to package.json and configure Vite (plus the Shadcn UI path aliases), written in one batch."""
+    client_dir = os.path.join(project_dir, app_name)
+    # Update package.json with npm-specific scripts
+    updates = {
+        'scripts': {
+            'dev': 'vite',
+            'build': 'vite build',
+            'preview': 'vite preview'
         }
-        update_package_json(project_dir, updates, subdir=app_name)
-        configure_vite(project_dir, subdir=app_name, use_shadcn=shadcn)
-        remove_default_styles(project_dir, subdir=app_name)
+    }
+    with ConfigSession(client_dir) as config:
+        update_package_json(project_dir, updates, subdir=app_name, config=config)
+        configure_vite(project_dir, subdir=app_name, use_shadcn=shadcn, config=config)
+        remove_default_styles(project_dir, subdir=app_name, config=config)
+        if shadcn:
+            configure_shadcn_paths(client_dir, config=config)
 
-        os.chdir("..")
-        console.print("✔ Vite setup complete.")
 
+async def setup_vite_npm(project_dir, app_name = 'client', template='react', use_typescript=True, shadcn=False, interactive: bool = True):
+    """Setup a new Vite project using npm."""
+    if not check_npm_package('vite', project_dir):
+        await create_vite_npm(project_dir, app_name, template, use_typescript, interactive=interactive)
+        await install_npm(os.path.join(project_dir, app_name))
+        configure_vite_npm(project_dir, app_name, shadcn=shadcn)
+        console.print("✔ Vite setup complete.")
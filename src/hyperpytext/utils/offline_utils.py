@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+from hyperpytext.utils.cache_utils import get_cache_dir
+
+WHEELHOUSE_DIR = "wheelhouse"
+PACKAGES_DIR = "packages"
+
+# Starter versions used instead of @latest when the package caches are on (offline runs and `cache warm`),
+# so an offline run asks for exactly what the cache was warmed with
+STARTER_VERSIONS = {
+    "vite": "7.0.0",
+    "shadcn": "2.9.3",
+}
+
+_pinned_starters = False
+
+def wheelhouse_dir() -> Path:
+    """Wheels of every server dependency set, uv installs from here offline (--find-links)."""
+    return get_cache_dir() / WHEELHOUSE_DIR
+
+
+def packages_dir(package_manager: str) -> Path:
+    """The bun/npm package cache used by offline runs and `cache warm`."""
+    return get_cache_dir() / PACKAGES_DIR / package_manager
+
+
+def is_offline() -> bool:
+    return os.environ.get("HYPERPY_OFFLINE") == "1"
+
+
+def use_package_caches(offline: bool = False):
+    """
+    Point bun, npm and uv at the local caches for the rest of the process, child processes included:
+    the bun/npm package caches live in the hyperpytext cache folder and the starters are pinned (see STARTER_VERSIONS).
+
+    With offline, nothing touches a registry: uv resolves from the wheelhouse only (--offline --no-index
+    --find-links) and npm runs with --offline. bun has no offline install, its client app comes from a
+    snapshot (see scaffold_utils.check_offline); its installs still prefer the cache (see bun_install_args).
+    """
+    pin_starters()
+    os.environ["BUN_INSTALL_CACHE_DIR"] = str(packages_dir("bun"))
+    os.environ["npm_config_cache"] = str(packages_dir("npm"))
+    if offline:
+        os.environ.update({
+            "HYPERPY_OFFLINE": "1",
+            "UV_OFFLINE": "1",
+            "UV_NO_INDEX": "1",
+            "UV_FIND_LINKS": str(wheelhouse_dir()),
+            "npm_config_offline": "true",
+        })
+
+
+def pin_starters():
+    """Use the STARTER_VERSIONS starters for the rest of the process, instead of @latest."""
+    global _pinned_starters
+    _pinned_starters = True
+
+
+def starter(package: str) -> str:
+    """Package spec of a starter (create vite, shadcn init): pinned with the package caches, @latest otherwise."""
+    return f"{package}@{STARTER_VERSIONS[package] if _pinned_starters else 'latest'}"
+
+
+def bun_install_args() -> list[str]:
+    """
+    Extra `bun install`/`bun add` flags: offline bun reads packages from its cache first, a cache miss still
+    goes to the registry (offline runs restore the bun client app from a snapshot instead, see check_offline).
+    """
+    return ["--prefer-offline"] if is_offline() else []
+
+
+def missing_offline_caches(package_manager: str) -> list[str]:
+    """What an offline run with this package manager lacks, empty when `cache warm` ran for it."""
+    missing = []
+    if not any(wheelhouse_dir().glob("*.whl")):
+        missing.append(f"no wheels in {wheelhouse_dir()}")
+    if not packages_dir(package_manager).is_dir():
+        missing.append(f"no {package_manager} package cache in {packages_dir(package_manager)}")
+    return missing
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+PACKAGE_MANAGERS = ["bun", "npm"]
+MAX_CONCURRENCY = 4
+
+@dataclass(frozen=True)
+class AppOptions:
+    """Answers to the project creation prompts."""
+    piccolo_auth: bool = False
+    piccolo_example: bool = False
+    sqlite_profiles: bool = False
+    package_manager: str = "bun"
+    fonts: bool = False
+    shadcn: bool = False
+
+
+@dataclass(frozen=True)
+class AppSpec:
+    """A single app entry of a batch spec file."""
+    app_name: str
+    options: AppOptions
@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import codecs
+import time
+import uuid
+import shutil
+import asyncio
+import hashlib
+import threading
+import subprocess
+from functools import cache
+from dataclasses import dataclass, replace
+from hyperpytext.utils.profile_utils import span
+from hyperpytext.utils.console_utils import console
+
+TERMINATE_TIMEOUT = 5
+PROBE_TIMEOUT = 30
+OUTPUT_BUFFER_BYTES = 64 * 1024
+TOOLS_CACHE_FILE = "tools.json"
+
+# Installs hit the network: a hung registry shouldn't stall the run forever, a flaky one gets retried
+INSTALL_TIMEOUT = float(os.environ.get("HYPERPY_INSTALL_TIMEOUT", 900))
+INSTALL_RETRIES = int(os.environ.get("HYPERPY_INSTALL_RETRIES", 2))
+RETRY_BACKOFF = 2.0
+
+@cache
+def check_system() -> str | None:
+    if sys.platform.startswith('win'):
+        return "windows"
+    elif sys.platform.startswith('darwin'):
+        return "mac"
+    elif sys.platform.startswith('linux'):
+        return "linux"
+
+
+def tool_command(tool: str) -> str:
+    """Executable name of a tool for this system, npm and npx are .cmd scripts on windows."""
+    return f"{tool}.cmd" if tool in ("npm", "npx") and check_system() == "windows" else tool
+
+
+@dataclass
+class ProcessStats:
+    """Counters of every child process started by this interpreter."""
+    spawns: int = 0
+    child_time: float = 0.0
+    retries: int = 0
+    timeouts: int = 0
+
+
+_stats = ProcessStats()
+_stats_lock = threading.Lock()
+
+def process_stats() -> ProcessStats:
+    """A copy of the process counters."""
+    with _stats_lock:
+        return replace(_stats)
+
+
+def _count(spawns: int = 0, child_time: float = 0.0, retries: int = 0, timeouts: int = 0):
+    with _stats_lock:
+        _stats.spawns += spawns
+        _stats.child_time += child_time
+        _stats.retries += retries
+        _stats.timeouts += timeouts
+
+
+class OutputBuffer:
+    """The last max_bytes of a process output, for error reports: long installs never grow memory."""
+
+    def __init__(self, max_bytes: int = OUTPUT_BUFFER_BYTES):
+        self.max_bytes = max_bytes
+        self._data = bytearray()
+
+    def feed(self, chunk: bytes):
+        self._data += chunk
+        if len(self._data) > self.max_bytes:
+            del self._data[:-self.max_bytes]
+
+    def tail(self, lines: int = 20) -> str:
+        return "\n".join(self._data.decode(errors="replace").splitlines()[-lines:])
+
+
+@dataclass(frozen=True)
+class ToolInfo:
+    name: str
+    path: str
+    version: str
+
+
+# Found tools and the stamp of their binary, checked on every probe (see probe_tool)
+_tools: dict[tuple[str, str], tuple[ToolInfo, list[int]]] = {}
+_tools_lock = threading.Lock()
+
+def _tools_cache_path():
+    from hyperpytext.utils.cache_utils import get_cache_dir
+    return get_cache_dir() / TOOLS_CACHE_FILE
+
+
+def _binary_stamp(path: str) -> list[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_tools_cache() -> dict:
+    try:
+        with open(_tools_cache_path(), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_tools_cache(entries: dict):
+    try:
+        path = _tools_cache_path()
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def probe_tool(tool: str) -> ToolInfo | None:
+    """
+    Find a tool on PATH and its version, None when it's missing or `--version` fails.
+    Probes are cached in memory and in the cache folder, keyed on PATH and checked against the binary path, mtime
+    and size on every call: `--version` only runs again when PATH changes or the tool is installed/upgraded.
+    Missing tools aren't cached, one installed while a long running process (the serve daemon) runs is found next time.
+    """
+    search_path = os.environ.get("PATH", "")
+    path = shutil.which(tool_command(tool), path=search_path)
+    if path is None:
+        return None
+    path = os.path.realpath(path)
+    try:
+        stamp = _binary_stamp(path)
+    except OSError:
+        return None
+
+    key = (tool, search_path)
+    with _tools_lock:
+        cached = _tools.get(key)
+    if cached and cached[0].path == path and cached[1] == stamp:
+        return cached[0]
+
+    cache_key = f"{tool}:{hashlib.sha256(search_path.encode()).hexdigest()[:16]}"
+    entries = _read_tools_cache()
+    entry = entries.get(cache_key)
+    if entry and entry["path"] == path and entry["stamp"] == stamp:
+        info = ToolInfo(tool, path, entry["version"])
+    else:
+        try:
+            result = run([tool_command(tool), "--version"], timeout=PROBE_TIMEOUT)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        info = ToolInfo(tool, path, result.stdout.strip())
+        entries[cache_key] = {"path": path, "stamp": stamp, "version": info.version}
+        _write_tools_cache(entries)
+
+    with _tools_lock:
+        _tools[key] = (info, stamp)
+    return info
+
+
+def command_name(cmd: list[str]) -> str:
+    """Short name of a command for reports: the tool and its subcommand, `bun install`, `bunx shadcn@latest`"""
+    tool = os.path.splitext(os.path.basename(cmd[0]))[0]
+    subcommand = next((arg for arg in cmd[1:] if not arg.startswith("-")), "")
+    return f"{tool} {subcommand}".strip()
+
+
+def run(cmd: list[str], cwd: str | None = None, timeout: float | None = PROBE_TIMEOUT, check: bool = True) -> subprocess.CompletedProcess:
+    """
+    Run a short command to completion and capture its output as text, ``subprocess.run`` with the process
+    counters and a profile span. Raises ``subprocess.CalledProcessError`` on a non zero exit code when check,
+    ``subprocess.TimeoutExpired`` after timeout seconds.
+    """
+    start = time.perf_counter()
+    _count(spawns=1)
+    with span(command_name(cmd), "process", cmd=" ".join(cmd)) as args:
+        try:
+            result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=timeout, check=check)
+        except subprocess.TimeoutExpired:
+            _count(timeouts=1)
+            raise
+        except subprocess.CalledProcessError as e:
+            args["exit_code"] = e.returncode
+            raise
+        finally:
+            _count(child_time=time.perf_counter() - start)
+        args["exit_code"] = result.returncode
+    return result
+
+
+async def _pump(stream: asyncio.StreamReader, output: OutputBuffer):
+    """Echo the child output as it comes and keep its tail."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while chunk := await stream.read(65536):
+        output.feed(chunk)
+        sys.stdout.write(decoder.decode(chunk))
+        sys.stdout.flush()
+
+
+async def _run_once(cmd: list[str], cwd: str | None, interactive: bool, capture: bool, timeout: float | None) -> tuple[int, OutputBuffer]:
+    output = OutputBuffer()
+    with span(command_name(cmd), "process", cmd=" ".join(cmd)) as args:
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            stdin=None if interactive else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE if capture else None,
+            stderr=asyncio.subprocess.STDOUT if capture else None,
+        )
+        _count(spawns=1)
+        try:
+            async with asyncio.timeout(timeout):
+                if capture:
+                    await _pump(process.stdout, output)
+                returncode = await process.wait()
+        except TimeoutError:
+            _count(timeouts=1)
+            await _terminate(process)
+            raise subprocess.TimeoutExpired(cmd, timeout, output=output.tail()) from None
+        except asyncio.CancelledError:
+            await _terminate(process)
+            raise
+        finally:
+            _count(child_time=time.perf_counter() - start)
+        args["exit_code"] = returncode
+    return returncode, output
+
+
+async def run_command(
+    cmd: list[str],
+    cwd: str | None = None,
+    interactive: bool = True,
+    timeout: float | None = None,
+    retries: int = 0,
+    capture: bool | None = None,
+) -> int:
+    """
+    Run a command as an asyncio subprocess, the async counterpart of ``subprocess.run(cmd, check=True)``.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Working directory for the command
+        interactive: When False stdin is closed, so the command can't block waiting for input
+        timeout: Seconds before the command is terminated and ``subprocess.TimeoutExpired`` raised, None to wait forever
+        retries: Extra attempts after a failure or a timeout, with exponential backoff (RETRY_BACKOFF seconds, doubling)
+        capture: Echo the output through a pipe and keep its tail for the error, by default only for non interactive
+            commands (prompts need the terminal)
+
+    Raises ``subprocess.CalledProcessError`` on a non zero exit code, with the output tail when captured.
+    If the awaiting task is cancelled (another step failed, ctrl+c...) the child process is terminated
+    before re-raising. Every attempt is counted (see process_stats) and gets a profile span with its exit code.
+    """
+    capture = not interactive if capture is None else capture
+    for attempt in range(retries + 1):
+        try:
+            returncode, output = await _run_once(cmd, cwd, interactive, capture, timeout)
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd, output=output.tail() if capture else None)
+            return returncode
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            if attempt == retries:
+                raise
+            delay = RETRY_BACKOFF * 2 ** attempt
+            _count(retries=1)
+            console.print(f"🚩 {command_name(cmd)} failed, retrying in {delay:.0f}s ({attempt + 1}/{retries})...")
+            await asyncio.sleep(delay)
+
+
+async def run_install(cmd: list[str], cwd: str | None = None) -> int:
+    """Run a network bound install (bun/npm install, uv sync...): no stdin, INSTALL_TIMEOUT, INSTALL_RETRIES."""
+    return await run_command(cmd, cwd=cwd, interactive=False, timeout=INSTALL_TIMEOUT, retries=INSTALL_RETRIES)
+
+
+async def _terminate(process: asyncio.subprocess.Process):
+    if process.returncode is not None:
+        return
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=TERMINATE_TIMEOUT)
+    except TimeoutError:
+        process.kill()
+        await process.wait()
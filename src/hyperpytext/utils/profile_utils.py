@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import threading
+import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# The profiler of the running app and the trace row (pid, tid) new spans go to. Context variables
+# follow the step tasks and the worker threads of asyncio.to_thread, so nested spans land on the row
+# of the step that opened them, and several apps (batch mode) can be profiled at once
+_profiler: ContextVar["Profiler | None"] = ContextVar("profiler", default=None)
+_row: ContextVar[tuple[int, int]] = ContextVar("profile_row", default=(0, 0))
+
+@dataclass
+class SpanSummary:
+    """Every span with the same name, added up."""
+    name: str
+    calls: int = 0
+    duration: float = 0.0
+    bytes: int = 0
+    exit_codes: set[int] = field(default_factory=set)
+    errors: int = 0
+
+
+class Profiler:
+    """
+    Collects timing spans and writes them in the Chrome trace event format (chrome://tracing, Perfetto):
+    a process per app, a row per step, the subprocesses and template writes nested inside their step.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._processes = 0
+        self.events: list[dict] = []
+
+    def _timestamp(self, ns: int) -> float:
+        return (ns - self._start) / 1000
+
+    def add_span(self, name: str, category: str, start_ns: int, end_ns: int, args: dict):
+        pid, tid = _row.get()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._timestamp(start_ns),
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def add_process(self, name: str) -> int:
+        with self._lock:
+            self._processes += 1
+            pid = self._processes
+            self.events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+        return pid
+
+    def add_row(self, pid: int, tid: int, name: str):
+        with self._lock:
+            self.events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+
+    def spans(self) -> list[dict]:
+        return sorted((event for event in self.events if event["ph"] == "X"), key=lambda event: event["ts"])
+
+    def summary(self) -> list[SpanSummary]:
+        """The spans added up by name, in the order they first started."""
+        summaries: dict[str, SpanSummary] = {}
+        for event in self.spans():
+            summary = summaries.setdefault(event["name"], SpanSummary(event["name"]))
+            summary.calls += 1
+            summary.duration += event["dur"] / 1_000_000
+            summary.bytes += event["args"].get("bytes", 0)
+            if "exit_code" in event["args"]:
+                summary.exit_codes.add(event["args"]["exit_code"])
+            if "error" in event["args"]:
+                summary.errors += 1
+        return list(summaries.values())
+
+    def write(self, path: str):
+        """Write the trace, loadable as is in chrome://tracing or https://ui.perfetto.dev"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+
+@contextlib.contextmanager
+def profiling(profiler: "Profiler | None", process_name: str = "create-hyperpy-app"):
+    """Record the spans opened inside the block on profiler, as a new trace process. With None nothing is recorded."""
+    if profiler is None:
+        yield
+        return
+    profiler_token = _profiler.set(profiler)
+    pid = profiler.add_process(process_name)
+    profiler.add_row(pid, 0, "main")
+    row_token = _row.set((pid, 0))
+    try:
+        yield
+    finally:
+        _row.reset(row_token)
+        _profiler.reset(profiler_token)
+
+
+def profile_row(tid: int, name: str):
+    """Send the next spans of the current context (a step task) to their own named row."""
+    profiler = _profiler.get()
+    if profiler is not None:
+        pid, _ = _row.get()
+        profiler.add_row(pid, tid, name)
+        _row.set((pid, tid))
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = "phase", **args):
+    """
+    Time the block as a span named name. The yielded dict is the span args: fill it with what's
+    known at the end (exit_code, bytes...). A failing block records the error type. Costs nothing
+    when no profiler is active.
+    """
+    profiler = _profiler.get()
+    if profiler is None:
+        yield args
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield args
+    except BaseException as e:
+        args.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        profiler.add_span(name, category, start, time.perf_counter_ns(), args)
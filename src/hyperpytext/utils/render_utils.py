@@ -0,0 +1,138 @@
+from datetime import datetime
+from dataclasses import dataclass, field
+from hyperpytext.utils.bundle_utils import load_template_group
+from hyperpytext.utils.console_utils import console
+from hyperpytext.utils.profile_utils import span
+from hyperpytext.utils.writer_utils import write_tree
+
+MANIFEST_TEMPLATE = 'react/manifest'
+
+@dataclass(frozen=True)
+class TemplateGroup:
+    """A manifest entry: one template file and the conditions to write it."""
+    section: str
+    template: str
+    when: tuple[str, ...] = ()
+    unless: tuple[str, ...] = ()
+    placeholders: tuple[str, ...] = ()
+    migrations: str | None = None
+    message: str | None = None
+
+    @property
+    def group(self) -> str:
+        return f"react/{self.section}/{self.template}"
+
+
+@dataclass(frozen=True)
+class PlannedFile:
+    """A rendered file, filename is relative to the section root."""
+    template: str
+    filename: str
+    content: str
+
+
+@dataclass
+class RenderPlan:
+    """Every file a section writes for an option set, plus the template groups left out and why."""
+    section: str
+    root: str
+    directories: list[str] = field(default_factory=list)
+    groups: list[TemplateGroup] = field(default_factory=list)
+    skipped: list[tuple[TemplateGroup, list[str]]] = field(default_factory=list)
+    files: list[PlannedFile] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return sum(len(file.content.encode()) for file in self.files)
+
+
+def load_manifest() -> dict:
+    return load_template_group(MANIFEST_TEMPLATE)
+
+
+def select_groups(section: str, options: dict[str, bool], manifest: dict | None = None) -> RenderPlan:
+    """Pick the template groups of a section for these options, from the manifest alone: no template is read."""
+    manifest = manifest or load_manifest()
+    spec = manifest[section]
+    plan = RenderPlan(section=section, root=spec.get('root', '.'), directories=list(spec.get('directories', [])))
+    for entry in spec['groups']:
+        group = TemplateGroup(
+            section=section,
+            template=entry['template'],
+            when=tuple(entry.get('when', [])),
+            unless=tuple(entry.get('unless', [])),
+            placeholders=tuple(entry.get('placeholders', [])),
+            migrations=entry.get('migrations'),
+            message=entry.get('message'),
+        )
+        missing = [option for option in group.when if not options.get(option, False)]
+        missing += [f"no {option}" for option in group.unless if options.get(option, False)]
+        if missing:
+            plan.skipped.append((group, missing))
+        else:
+            plan.groups.append(group)
+    return plan
+
+
+def fill_placeholders(text: str, values: dict[str, str], placeholders: tuple[str, ...]) -> str:
+    """Fill the group {placeholders}, any other brace in the template (f-strings, toml tables...) is left alone."""
+    for placeholder in placeholders:
+        if placeholder not in values:
+            raise KeyError(f"No value for the {{{placeholder}}} placeholder")
+        text = text.replace(f"{{{placeholder}}}", values[placeholder])
+    return text
+
+
+def render_group(group: TemplateGroup, values: dict[str, str]) -> list[PlannedFile]:
+    """Load a template group and fill its placeholders."""
+    templates = load_template_group(group.group)
+    if isinstance(templates, dict):
+        templates = [templates]
+
+    values = dict(values)
+    if group.migrations:
+        values['filename'] = f"{group.migrations}_{values['migrations_id']}.py"
+    return [
+        PlannedFile(
+            template=group.template,
+            filename=fill_placeholders(template['filename'], values, group.placeholders),
+            content=fill_placeholders(template['content'], values, group.placeholders),
+        )
+        for template in templates
+    ]
+
+
+def plan_section(section: str, options: dict[str, bool], values: dict[str, str] | None = None) -> RenderPlan:
+    """The exact file plan of a section: only the selected template groups are loaded and rendered."""
+    plan = select_groups(section, options)
+    for group in plan.groups:
+        plan.files.extend(render_group(group, values or {}))
+    return plan
+
+
+def migrations_values(now: datetime | None = None) -> dict[str, str]:
+    """Placeholder values shared by every piccolo migration of an app, so they all get the same timestamp."""
+    now = now or datetime.now()
+    return {
+        'migrations_timestamp': now.strftime("%Y-%m-%dT%H:%M:%S:%f"),
+        'migrations_id': now.strftime('%Y_%m_%dt%H_%M_%S_%f'),
+    }
+
+
+def write_plan(plan: RenderPlan, base_dir: str, fsync: str = "none"):
+    """
+    Write the planned files under base_dir (the section root is already part of base_dir),
+    staged and published at once, see writer_utils.write_tree.
+    """
+    with span(f"write {plan.section} templates", "templates", files=len(plan.files), bytes=plan.size):
+        write_tree([(file.filename, file.content) for file in plan.files], base_dir, plan.directories, fsync=fsync)
+
+    files_by_template = {}
+    for file in plan.files:
+        files_by_template.setdefault(file.template, []).append(file)
+    for group in plan.groups:
+        if group.message:
+            console.print(f"✔ {group.message}")
+        else:
+            for file in files_by_template.get(group.template, []):
+                console.print(f"✔ Created {file.filename}")
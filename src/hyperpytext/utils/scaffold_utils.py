@@ -0,0 +1,491 @@
+import os
+import time
+import asyncio
+import tempfile
+import itertools
+from functools import partial
+from collections.abc import Callable
+from datetime import datetime
+from dataclasses import asdict, dataclass, fields
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from hyperpytext.utils.dag_utils import Step, in_thread, run_steps
+from hyperpytext.utils.journal_utils import StepJournal, inputs_hash
+from hyperpytext.utils.bundle_utils import templates_hash
+from hyperpytext.utils.npm_shadcnui_utils import setup_shadcn_npm
+from hyperpytext.utils.npm_tailwind_utils import setup_tailwind_npm
+from hyperpytext.utils.npm_vite_utils import create_vite_npm, install_npm, configure_vite_npm
+from hyperpytext.utils.npm_utils import check_npm, check_npm_package, npm_install_instructions
+from hyperpytext.utils.bun_utils import check_bun, bun_install_instructions, create_vite_bun, install_bun, configure_vite_bun, setup_tailwind_bun, setup_shadcn_bun
+from hyperpytext.utils.cache_utils import client_cache_key, client_tool_versions, has_client_snapshot, restore_client_snapshot, save_client_snapshot
+from hyperpytext.utils.render_utils import RenderPlan, migrations_values, plan_section, write_plan
+from hyperpytext.utils.templates_utils import pyproject_values, render_pyproject
+from hyperpytext.utils.update_utils import CONFLICT_MARKER, FileUpdate, dependencies_hash, load_app_manifest, record_app_manifest, save_app_manifest, update_files
+from hyperpytext.utils.uv_utils import SERVER_DEPENDENCIES, DB_EXAMPLE_DEPENDENCIES, check_uv, install_uv_dependencies, uv_install_instructions, uv_sync, warm_wheelhouse
+from hyperpytext.utils.offline_utils import STARTER_VERSIONS, missing_offline_caches, pin_starters, starter
+from hyperpytext.utils.profile_utils import Profiler, profiling, span
+from hyperpytext.utils.options_utils import MAX_CONCURRENCY, PACKAGE_MANAGERS, AppOptions, AppSpec
+from hyperpytext.utils.console_utils import console
+
+
+@dataclass
+class BatchResult:
+    """Outcome of scaffolding one app in batch mode."""
+    app_name: str
+    app_dir: str
+    duration: float
+    error: str | None = None
+
+
+@dataclass
+class UpdateResult:
+    """Outcome of updating an app: what happened to each template file and to the server environment."""
+    files: list[FileUpdate]
+    dependencies: str = "unchanged"  # unchanged, synced, or pending (needs a sync, dry run or unresolved conflict)
+
+
+def server_dependencies(options: AppOptions) -> list[str]:
+    """Python dependencies for the server, based on the selected options."""
+    dependencies = list(SERVER_DEPENDENCIES)
+    if options.piccolo_example:
+        dependencies += DB_EXAMPLE_DEPENDENCIES
+    return dependencies
+
+
+def check_toolchain(package_manager: str) -> bool:
+    """Check that uv and the client package manager are available, print install instructions otherwise."""
+    with span("check_uv"):
+        uv_found = check_uv()
+    if not uv_found:
+        uv_install_instructions()
+        return False
+    with span(f"check_{package_manager}"):
+        found = check_bun() if package_manager == "bun" else check_npm()
+    if not found:
+        if package_manager == "bun":
+            bun_install_instructions()
+        else:
+            npm_install_instructions()
+        return False
+    return True
+
+
+def app_values(app_name: str, options: AppOptions, migrations: dict[str, str] | None = None) -> dict[str, str]:
+    """Placeholder values of every template of an app."""
+    return {**pyproject_values(app_name, server_dependencies(options)), **(migrations or migrations_values())}
+
+
+def server_steps(app_dir: str, options: AppOptions, fsync: str = "none", plan: RenderPlan | None = None) -> list[Step]:
+    """
+    Steps to setup the server files and the uv environment inside app_dir/server.
+    The pyproject.toml template lists every dependency, so uv installs them with a single sync.
+    """
+    server_dir = os.path.join(app_dir, 'server')
+    app_name = os.path.basename(os.path.normpath(app_dir))
+    dependencies = server_dependencies(options)
+    plan = plan or plan_section('server', asdict(options), app_values(app_name, options))
+    return [
+        Step(
+            "server_files",
+            in_thread(write_plan, plan, app_dir, fsync=fsync),
+            inputs=inputs_hash(options.piccolo_auth, options.piccolo_example, options.sqlite_profiles, app_name, dependencies, templates_hash()),
+            outputs=("server/pyproject.toml", "server/run_server.py"),
+        ),
+        Step(
+            "uv_sync",
+            partial(install_uv_dependencies, server_dir, dependencies, app_name),
+            deps=("server_files",),
+            inputs=inputs_hash(sorted(dependencies)),
+            outputs=("server/.venv",),
+        ),
+    ]
+
+
+def client_snapshot_key(options: AppOptions, interactive: bool = True) -> str | None:
+    """
+    Cache key of the finished client tree for these options, None when the tree can't be cached:
+    an interactive shadcn init depends on the answers given at the prompt, not only on the options.
+    """
+    if options.shadcn and interactive:
+        return None
+    return client_cache_key(
+        options.package_manager,
+        template="react",
+        use_typescript=True,
+        shadcn=options.shadcn,
+        fonts=options.fonts,
+        tool_versions=client_tool_versions(options.package_manager),
+        starters={package: starter(package) for package in STARTER_VERSIONS},
+    )
+
+
+def _client_complete(client_dir: str, options: AppOptions) -> bool:
+    """Some client helpers report failures without raising, only snapshot trees where every piece made it."""
+    packages = ["vite", "tailwindcss"] + (["geist"] if options.fonts else [])
+    if not all(check_npm_package(package, client_dir) for package in packages):
+        return False
+    return not options.shadcn or os.path.exists(os.path.join(client_dir, "components.json"))
+
+
+def _save_client(cache_key: str, client_dir: str, options: AppOptions):
+    if _client_complete(client_dir, options):
+        save_client_snapshot(cache_key, client_dir)
+    else:
+        console.print("🚩 The client app setup is incomplete, it won't be cached.")
+
+
+def client_steps(
+    app_dir: str,
+    options: AppOptions,
+    interactive: bool = True,
+    use_cache: bool = True,
+    fsync: str = "none",
+    plan: RenderPlan | None = None,
+) -> list[Step]:
+    """
+    Steps to setup the vite client app inside app_dir/client.
+    Everything that edits package.json (installs, scripts) runs in sequence, the client
+    templates only need the vite project to exist and run next to the installs.
+
+    With use_cache, a client tree built before with the same options, tool versions and client
+    templates is restored from the snapshot cache in a single step, otherwise the finished tree
+    is stored there once every other client step is done.
+    """
+    client_dir = os.path.join(app_dir, "client")
+    cache_key = client_snapshot_key(options, interactive) if use_cache else None
+    if cache_key and has_client_snapshot(cache_key):
+        return [
+            Step(
+                "client_snapshot",
+                in_thread(restore_client_snapshot, cache_key, client_dir),
+                inputs=inputs_hash(cache_key),
+                outputs=("client/package.json", "client/node_modules"),
+            )
+        ]
+
+    if options.package_manager == "bun":
+        create_vite, install, configure = create_vite_bun, install_bun, configure_vite_bun
+        setup_tailwind, setup_shadcn = setup_tailwind_bun, setup_shadcn_bun
+    else:
+        create_vite, install, configure = create_vite_npm, install_npm, configure_vite_npm
+        setup_tailwind, setup_shadcn = setup_tailwind_npm, setup_shadcn_npm
+
+    package_manager = options.package_manager
+    steps = [
+        Step(
+            "vite_create",
+            partial(create_vite, app_dir, app_name="client", template="react", use_typescript=True, interactive=interactive),
+            inputs=inputs_hash(package_manager, "react", True),
+            outputs=("client/package.json",),
+        ),
+        Step(
+            "client_install",
+            partial(install, client_dir),
+            deps=("vite_create",),
+            inputs=inputs_hash(package_manager),
+            outputs=("client/node_modules",),
+        ),
+        Step(
+            "vite_config",
+            in_thread(configure, app_dir, "client", shadcn=options.shadcn),
+            deps=("client_install",),
+            inputs=inputs_hash(package_manager, options.shadcn),
+            outputs=("client/vite.config.ts",),
+        ),
+        Step(
+            "tailwind",
+            partial(setup_tailwind, client_dir, options.fonts),
+            deps=("vite_config",),
+            inputs=inputs_hash(package_manager, options.fonts),
+            outputs=("client/node_modules/tailwindcss", "client/node_modules/@tailwindcss/vite"),
+        ),
+        Step(
+            "client_files",
+            in_thread(write_plan, plan or plan_section('client', asdict(options)), client_dir, fsync=fsync),
+            deps=("vite_create",),
+            inputs=inputs_hash(options.fonts, templates_hash()),
+            outputs=("client/src/App.tsx",),
+        ),
+    ]
+    if options.shadcn:
+        steps.append(
+            Step(
+                "shadcn",
+                partial(setup_shadcn, client_dir, interactive=interactive),
+                deps=("tailwind", "client_files"),
+                inputs=inputs_hash(package_manager),
+                outputs=("client/components.json",),
+            )
+        )
+    if cache_key:
+        last_steps = ("shadcn",) if options.shadcn else ("tailwind", "client_files")
+        steps.append(Step("client_cache", in_thread(_save_client, cache_key, client_dir, options), deps=last_steps))
+    return steps
+
+
+def app_steps(
+    app_dir: str,
+    options: AppOptions,
+    interactive: bool = True,
+    use_cache: bool = True,
+    fsync: str = "none",
+    migrations: dict[str, str] | None = None,
+) -> list[Step]:
+    """
+    Every step of an app: the server and client steps, then the app manifest (see update_utils.record_app_manifest),
+    recorded once everything else is done so `update` only ever starts from a complete app.
+    """
+    app_name = os.path.basename(os.path.normpath(app_dir))
+    migrations = migrations or migrations_values()
+    values = app_values(app_name, options, migrations)
+    with span("render templates", "templates") as args:
+        plans = plan_app(app_dir, options, values)
+        args.update(files=sum(len(plan.files) for plan in plans), bytes=sum(plan.size for plan in plans))
+    steps = (
+        server_steps(app_dir, options, fsync=fsync, plan=plans[0])
+        + client_steps(app_dir, options, interactive=interactive, use_cache=use_cache, fsync=fsync, plan=plans[1])
+    )
+    record = partial(record_app_manifest, app_dir, asdict(options), app_name, migrations, server_dependencies(options), values, plans)
+    steps.append(
+        Step(
+            "app_manifest",
+            in_thread(record),
+            deps=tuple(step.name for step in steps),
+            inputs=inputs_hash(asdict(options), values, templates_hash()),
+            outputs=(".hyperpy/manifest.json",),
+        )
+    )
+    return steps
+
+
+async def scaffold_app_async(
+    app_dir: str,
+    options: AppOptions,
+    interactive: bool = True,
+    max_concurrency: int | None = MAX_CONCURRENCY,
+    use_cache: bool = True,
+    fsync: str = "none",
+    resume: bool = False,
+    on_event: Callable[[dict], None] | None = None,
+):
+    """scaffold_app for a running event loop (the serve daemon), on_event gets the step progress (see run_steps)."""
+    os.makedirs(app_dir, exist_ok=True)
+    journal = StepJournal(app_dir, asdict(options), resume=resume)
+    # Migration ids come from the journal, a resumed run renders the same migration files
+    migrations = migrations_values(datetime.fromisoformat(journal.created_at))
+    steps = await asyncio.to_thread(
+        app_steps, app_dir, options, interactive=interactive, use_cache=use_cache, fsync=fsync, migrations=migrations
+    )
+    await run_steps(steps, max_concurrency=max_concurrency, journal=journal, on_event=on_event)
+
+
+def scaffold_app(
+    app_dir: str,
+    options: AppOptions,
+    interactive: bool = True,
+    max_concurrency: int | None = MAX_CONCURRENCY,
+    use_cache: bool = True,
+    fsync: str = "none",
+    resume: bool = False,
+):
+    """
+    Create a full app (server + client) in app_dir.
+
+    The server and client steps run as one dependency graph, so the uv environment, the
+    templates and the client installs overlap instead of running one after the other.
+    All the helpers receive explicit paths, the process working directory is never changed,
+    so several apps can be scaffolded concurrently from the same interpreter.
+    The template files are staged and published at once, fsync sets how durable they are (see write_tree).
+    Completed steps are recorded on the app journal, with resume the ones that are still valid are skipped.
+    """
+    asyncio.run(scaffold_app_async(app_dir, options, interactive, max_concurrency, use_cache, fsync, resume))
+
+
+def check_offline(options: AppOptions, use_cache: bool = True, interactive: bool = True) -> list[str]:
+    """What an offline run of an app with these options lacks, empty when it can run without a registry."""
+    # An offline run pins the starters, the cached client apps it can use are keyed with them
+    pin_starters()
+    missing = missing_offline_caches(options.package_manager)
+    if options.shadcn or options.package_manager == "bun":
+        # shadcn init fetches its styles from the shadcn registry, and bun has no offline install (a cache miss
+        # goes to the registry): only a cached client app, restored without running them, works offline
+        cache_key = client_snapshot_key(options, interactive) if use_cache else None
+        if not cache_key or not has_client_snapshot(cache_key):
+            what = "with Shadcn UI " if options.shadcn else ""
+            missing.append(f"no cached {options.package_manager} client app {what}for these options")
+    return missing
+
+
+async def _warm_clients(package_manager: str, max_concurrency: int | None):
+    """Build and snapshot the client app of every fonts/shadcn combination that isn't cached yet."""
+    for fonts, shadcn in itertools.product([False, True], repeat=2):
+        options = AppOptions(package_manager=package_manager, fonts=fonts, shadcn=shadcn)
+        if has_client_snapshot(client_snapshot_key(options, interactive=False)):
+            console.print(f"✔ Client app already cached for {package_manager} (fonts={fonts}, shadcn={shadcn})")
+            continue
+        with tempfile.TemporaryDirectory() as app_dir:
+            await run_steps(client_steps(app_dir, options, interactive=False), max_concurrency=max_concurrency)
+
+
+def warm_cache(package_managers: list[str], max_concurrency: int | None = MAX_CONCURRENCY):
+    """
+    Fill the caches an offline run installs from (see offline_utils): the wheelhouse of every server
+    dependency set, and for each package manager its package cache plus a client app snapshot per
+    fonts/shadcn combination, built with the pinned starters.
+    """
+    asyncio.run(warm_wheelhouse([SERVER_DEPENDENCIES, SERVER_DEPENDENCIES + DB_EXAMPLE_DEPENDENCIES]))
+    for package_manager in package_managers:
+        asyncio.run(_warm_clients(package_manager, max_concurrency))
+
+
+def plan_app(app_dir: str, options: AppOptions, values: dict[str, str] | None = None) -> list[RenderPlan]:
+    """The server and client template files an app gets for these options, rendered but not written."""
+    values = values or app_values(os.path.basename(os.path.normpath(app_dir)), options)
+    return [plan_section(section, asdict(options), values) for section in ("server", "client")]
+
+
+def update_app(app_dir: str, fsync: str = "none", dry_run: bool = False) -> UpdateResult:
+    """
+    Bring an app up to date with the installed templates, keeping the user changes (see update_utils.update_files).
+    The options, app name and migration ids come from the app manifest, so the files render as they were created.
+
+    uv only runs when the dependency templates changed (the dependency set or its pinned lockfile): from the
+    pinned lockfile when pyproject.toml is the template one, resolving the user changes otherwise.
+    The client package manager never runs, no client template touches package.json.
+    """
+    manifest = load_app_manifest(app_dir)
+    if not manifest:
+        raise FileNotFoundError(f"{app_dir} has no template manifest, only apps created with one can be updated")
+
+    options = AppOptions(**manifest["options"])
+    dependencies = server_dependencies(options)
+    values = app_values(manifest["app_name"], options, manifest["migrations"])
+    result = UpdateResult(update_files(app_dir, manifest, values, fsync=fsync, dry_run=dry_run))
+    if manifest.get("dependencies") == dependencies_hash(dependencies):
+        return result
+
+    result.dependencies = "pending"
+    server_dir = os.path.join(app_dir, "server")
+    pyproject_path = os.path.join(server_dir, "pyproject.toml")
+    pyproject = open(pyproject_path).read() if os.path.exists(pyproject_path) else None
+    if dry_run:
+        return result
+    if pyproject is None or CONFLICT_MARKER in pyproject:
+        console.print("🚩 The server dependencies changed: resolve server/pyproject.toml, then run `create-hyperpy-app update` again")
+        return result
+
+    if pyproject == render_pyproject(manifest["app_name"], dependencies)[1]:
+        asyncio.run(install_uv_dependencies(server_dir, dependencies, manifest["app_name"]))
+    else:
+        console.print("Syncing environment with your pyproject.toml changes...")
+        asyncio.run(uv_sync(server_dir))
+        console.print("✔ Environment set up successfully!")
+    manifest["dependencies"] = dependencies_hash(dependencies)
+    save_app_manifest(app_dir, manifest)
+    result.dependencies = "synced"
+    return result
+
+
+def load_specs(spec_file: str) -> list[AppSpec]:
+    """
+    Load the app specs from a yaml file, either a list of apps or a mapping with an ``apps`` list.
+    Each app takes an ``app_name`` plus the prompt answers, missing answers fall back to the prompt defaults:
+
+        apps:
+          - app_name: tenant_a
+            piccolo_auth: true
+            package_manager: npm
+    """
+    import yaml
+
+    with open(spec_file, 'r') as file:
+        data = yaml.safe_load(file) or []
+
+    entries = data.get('apps', []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError(f"{spec_file} must contain a list of apps")
+
+    specs, app_names = [], set()
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get('app_name'):
+            raise ValueError(f"App #{index + 1} in {spec_file} is missing an app_name")
+
+        entry = dict(entry)
+        app_name = check_app_name(str(entry.pop('app_name')))
+        if app_name in app_names:
+            raise ValueError(f"Duplicated app_name '{app_name}' in {spec_file}")
+        app_names.add(app_name)
+        specs.append(AppSpec(app_name=app_name, options=app_options(app_name, entry)))
+    return specs
+
+
+def check_app_name(app_name: str) -> str:
+    """The app name, if it names a single folder inside the output folder: no path separators, '.', '..' or absolute paths."""
+    if (
+        not app_name
+        or app_name in ('.', '..')
+        or os.path.isabs(app_name)
+        or os.path.basename(app_name) != app_name
+        or (os.altsep and os.altsep in app_name)
+    ):
+        raise ValueError(f"Invalid app_name '{app_name}', it names a folder inside the output folder")
+    return app_name
+
+
+def app_options(app_name: str, answers: dict) -> AppOptions:
+    """The options of an app from its prompt answers (a spec file entry, a serve request), missing ones take the defaults."""
+    unknown = set(answers) - {field.name for field in fields(AppOptions)}
+    if unknown:
+        raise ValueError(f"Unknown options for '{app_name}': {', '.join(sorted(unknown))}")
+    for key, value in answers.items():
+        if key == 'package_manager':
+            if value not in PACKAGE_MANAGERS:
+                raise ValueError(f"'{app_name}': package_manager must be one of {PACKAGE_MANAGERS}")
+        elif not isinstance(value, bool):
+            raise ValueError(f"'{app_name}': {key} must be true or false")
+    return AppOptions(**answers)
+
+
+def _scaffold_spec(
+    spec: AppSpec,
+    base_dir: str,
+    max_concurrency: int | None,
+    use_cache: bool,
+    fsync: str,
+    resume: bool,
+    profiler: Profiler | None,
+) -> BatchResult:
+    app_dir = os.path.abspath(os.path.join(base_dir, spec.app_name))
+    start = time.perf_counter()
+    try:
+        with profiling(profiler, spec.app_name):
+            scaffold_app(app_dir, spec.options, interactive=False, max_concurrency=max_concurrency, use_cache=use_cache, fsync=fsync, resume=resume)
+        return BatchResult(spec.app_name, app_dir, time.perf_counter() - start)
+    except Exception as e:
+        return BatchResult(spec.app_name, app_dir, time.perf_counter() - start, error=str(e) or type(e).__name__)
+
+
+def run_batch(
+    specs: list[AppSpec],
+    base_dir: str,
+    jobs: int = 4,
+    max_concurrency: int | None = MAX_CONCURRENCY,
+    use_cache: bool = True,
+    fsync: str = "none",
+    resume: bool = False,
+    profiler: Profiler | None = None,
+) -> list[BatchResult]:
+    """Scaffold every spec in base_dir, running up to ``jobs`` apps at the same time, each one a process of the profile."""
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [executor.submit(_scaffold_spec, spec, base_dir, max_concurrency, use_cache, fsync, resume, profiler) for spec in specs]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.error:
+                console.print(f"🚩 Failed to create '{result.app_name}': {result.error}")
+            else:
+                console.print(f"✔ Created '{result.app_name}' in {result.duration:.1f}s")
+            results.append(result)
+
+    # Keep the spec file order for reporting
+    order = {spec.app_name: index for index, spec in enumerate(specs)}
+    return sorted(results, key=lambda result: order[result.app_name])
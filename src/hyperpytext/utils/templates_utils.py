@@ -1,45 +1,61 @@
 import os
-import yaml
+import re
 from pathlib import Path
-from importlib import resources
-from rich.console import Console
+from functools import cache
+from hyperpytext.utils.bundle_utils import load_template_group
+from hyperpytext.utils.render_utils import fill_placeholders, migrations_values, plan_section, write_plan
 
-console=Console()
 
-def create_file(filename, content:str = ''):
-    """Writes the template file"""
+def create_file(filename, content:str = '', base_dir:str | None = None):
+    """Writes the template file, relative to base_dir when given"""
+    if base_dir:
+        filename = os.path.normpath(os.path.join(base_dir, filename))
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     with open(filename, 'w') as f:
         f.write(content)
 
+@cache
 def get_template_path(template_path: str) -> Path:
-    """Get the absolute path to a template directory."""
+    """Get the absolute path to a template directory, resolved on first use."""
+    from importlib import resources
+
     with resources.path('hyperpytext.templates', template_path) as path:
         return path
 
-SERVER_TEMPLATES_PATH = get_template_path('react/server')
-CLIENT_TEMPLATES_PATH = get_template_path('react/client')
-
-def create_client_files(client_dir:str, fonts:bool = False):
-    os.chdir(client_dir)
-    for template_file in os.listdir(CLIENT_TEMPLATES_PATH):
-        if template_file.endswith('.yaml'):
-            with open(os.path.join(CLIENT_TEMPLATES_PATH, template_file), 'r') as file:
-                templates = yaml.safe_load(file)
-
-                # Geist fonts
-                if template_file == 'fonts.css.yaml':
-                    if fonts:
-                        filename = templates['filename']
-                        content = templates['content']
-                        create_file(filename, content)
-                        console.print(f"✔ Created {filename}")
-                    else:
-                        continue
-
-                # All other files
-                else:
-                    filename = templates['filename']
-                    content = templates['content']
-                    create_file(filename, content)
-                    console.print(f"✔ Created {filename}")
+def project_name(app_name: str) -> str:
+    """Normalized python project name (PEP 503) for the app, as uv writes it on the lockfile."""
+    name = re.sub(r"[^a-z0-9]+", "-", app_name.lower()).strip("-")
+    return name or "server"
+
+def pyproject_values(app_name: str, dependencies: list[str]) -> dict[str, str]:
+    """Placeholder values of the server pyproject.toml template."""
+    return {
+        'app_name': project_name(app_name),
+        'dependencies': '\n'.join(f'    "{dependency}",' for dependency in dependencies),
+    }
+
+def render_pyproject(app_name: str, dependencies: list[str]) -> tuple[str, str]:
+    """Returns the filename and content of the server pyproject.toml, with every dependency on it."""
+    template = load_template_group('react/server/pyproject')
+    values = pyproject_values(app_name, dependencies)
+    return template['filename'], fill_placeholders(template['content'], values, tuple(values))
+
+def create_server_files(
+    app_dir:str,
+    piccolo_auth:bool = False,
+    piccolo_example:bool = False,
+    sqlite_profiles:bool = False,
+    app_name:str = 'server',
+    dependencies:list[str] | None = None,
+    fsync:str = "none",
+):
+    """Writes the server templates into app_dir, the manifest decides which ones for the selected options."""
+    values = {**pyproject_values(app_name, dependencies or []), **migrations_values()}
+    options = {'piccolo_auth': piccolo_auth, 'piccolo_example': piccolo_example, 'sqlite_profiles': sqlite_profiles}
+    plan = plan_section('server', options, values)
+    write_plan(plan, app_dir, fsync=fsync)
+
+def create_client_files(client_dir:str, fonts:bool = False, fsync:str = "none"):
+    """Writes the client templates into client_dir, the Geist fonts stylesheet only when selected."""
+    plan = plan_section('client', {'fonts': fonts})
+    write_plan(plan, client_dir, fsync=fsync)
@@ -0,0 +1,210 @@
+import os
+import json
+import uuid
+import hashlib
+import tempfile
+import subprocess
+from dataclasses import dataclass
+from hyperpytext.utils.bundle_utils import template_group_hash
+from hyperpytext.utils.journal_utils import JOURNAL_DIR, inputs_hash
+from hyperpytext.utils.process_utils import run
+from hyperpytext.utils.render_utils import RenderPlan, TemplateGroup, load_manifest, render_group, select_groups
+from hyperpytext.utils.uv_utils import get_uv_lock_template
+from hyperpytext.utils.writer_utils import write_tree
+
+APP_MANIFEST_FILE = "manifest.json"
+BASE_DIR = "base"
+SECTIONS = ("server", "client")
+CONFLICT_MARKER = "<<<<<<< "
+
+@dataclass(frozen=True)
+class FileUpdate:
+    """
+    What an update did to a template file, path is relative to the app folder. Actions:
+    added, updated (untouched by the user, replaced), merged (edited, changes merged cleanly),
+    conflict (edited, merged with conflict markers), unchanged, skipped (deleted by the user, left deleted),
+    orphaned (no template writes it anymore, left alone).
+    """
+    path: str
+    group: str
+    action: str
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def group_hash(group: TemplateGroup, values: dict[str, str]) -> str:
+    """Version of a template group as rendered for an app: the template content plus the values it's filled with."""
+    placeholders = {placeholder: values.get(placeholder) for placeholder in group.placeholders}
+    migrations_id = values.get('migrations_id') if group.migrations else None
+    return inputs_hash(template_group_hash(group.group), placeholders, migrations_id)
+
+
+def dependencies_hash(dependencies: list[str]) -> str:
+    """Version of the server dependencies: the dependency set plus the pinned lockfile template shipped for it."""
+    lock_template = get_uv_lock_template(dependencies)
+    lock_hash = template_group_hash(f"react/server/locks/{lock_template.stem}") if lock_template else None
+    return inputs_hash(sorted(dependencies), lock_hash)
+
+
+def app_path(root: str, filename: str) -> str:
+    """Path of a planned file relative to the app folder."""
+    return os.path.normpath(os.path.join(root, filename))
+
+
+def app_manifest_path(app_dir: str) -> str:
+    return os.path.join(app_dir, JOURNAL_DIR, APP_MANIFEST_FILE)
+
+
+def load_app_manifest(app_dir: str) -> dict:
+    """The template files recorded for an app, empty when there's no manifest (or it can't be read)."""
+    try:
+        with open(app_manifest_path(app_dir), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_app_manifest(app_dir: str, manifest: dict):
+    path = app_manifest_path(app_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def record_app_manifest(
+    app_dir: str,
+    options: dict,
+    app_name: str,
+    migrations: dict[str, str],
+    dependencies: list[str],
+    values: dict[str, str],
+    plans: list[RenderPlan],
+):
+    """
+    Record every template file written to an app, in <app_dir>/.hyperpy/manifest.json:
+
+        {"options": {...}, "app_name": "...", "migrations": {...}, "dependencies": "<hash>",
+         "groups": {"react/server/app": "<hash>"}, "files": {"server/src/app.py": {"group": "...", "hash": "<hash>"}}}
+
+    plus a copy of each file as rendered under .hyperpy/base, the common ancestor `update` merges user edits from.
+    """
+    groups, files, base_files = {}, {}, []
+    for plan in plans:
+        for group in plan.groups:
+            groups[group.group] = group_hash(group, values)
+        for file in plan.files:
+            path = app_path(plan.root, file.filename)
+            files[path] = {"group": f"react/{plan.section}/{file.template}", "hash": content_hash(file.content)}
+            base_files.append((path, file.content))
+
+    write_tree(base_files, os.path.join(app_dir, JOURNAL_DIR, BASE_DIR))
+    save_app_manifest(app_dir, {
+        "options": options,
+        "app_name": app_name,
+        "migrations": migrations,
+        "dependencies": dependencies_hash(dependencies),
+        "groups": groups,
+        "files": files,
+    })
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def merge_text(base: str, ours: str, theirs: str) -> tuple[str, bool]:
+    """
+    Three way merge of a file: the user version (ours) and the new template (theirs) from the previous template (base).
+    Uses `git merge-file`, without git any overlapping change is a whole file conflict. Returns the text and whether it conflicts.
+    """
+    if ours == base or ours == theirs:
+        return theirs, False
+    if theirs == base:
+        return ours, False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name, text in (("yours", ours), ("base", base), ("template", theirs)):
+            paths.append(os.path.join(tmp, name))
+            with open(paths[-1], "w") as f:
+                f.write(text)
+        try:
+            result = run(["git", "merge-file", "-p", "-L", "yours", "-L", "previous template", "-L", "new template", *paths], check=False)
+        except (OSError, subprocess.TimeoutExpired):
+            result = None
+
+    # git merge-file exits with the number of conflicts, or a negative value (255) on errors
+    if result is not None and 0 <= result.returncode < 128:
+        return result.stdout, result.returncode > 0
+    ours = ours if ours.endswith("\n") else f"{ours}\n"
+    theirs = theirs if theirs.endswith("\n") else f"{theirs}\n"
+    return f"{CONFLICT_MARKER}yours\n{ours}=======\n{theirs}>>>>>>> new template\n", True
+
+
+def _update_file(app_dir: str, path: str, content: str, entry: dict | None) -> tuple[str, str | None]:
+    """The action for a re-rendered file and the content to write, None to leave the file as it is."""
+    current = _read(os.path.join(app_dir, path))
+    if current is None:
+        return ("skipped", None) if entry else ("added", content)
+    if current == content:
+        return "unchanged", None
+    if entry and content_hash(current) == entry["hash"]:
+        return "updated", content
+
+    base = _read(os.path.join(app_dir, JOURNAL_DIR, BASE_DIR, path)) if entry else None
+    merged, conflicted = merge_text(base or "", current, content)
+    return ("conflict" if conflicted else "merged"), merged
+
+
+def update_files(app_dir: str, manifest: dict, values: dict[str, str], fsync: str = "none", dry_run: bool = False) -> list[FileUpdate]:
+    """
+    Re-apply the current templates to an app recorded on manifest (see record_app_manifest).
+
+    Only the template groups whose version changed (template content or the values filling it) are rendered.
+    Each of their files is replaced if the user never touched it, merged with the user changes otherwise.
+    The files are written staged and published at once, then the manifest and the base copies are updated.
+    With dry_run nothing is written, the returned updates tell what would change.
+    """
+    templates = load_manifest()
+    recorded_groups, recorded_files = manifest.get("groups", {}), manifest.get("files", {})
+    groups, files, updates, writes, base_files = {}, {}, [], [], []
+
+    for section in SECTIONS:
+        plan = select_groups(section, manifest["options"], templates)
+        for group in plan.groups:
+            version = group_hash(group, values)
+            groups[group.group] = version
+            if recorded_groups.get(group.group) == version:
+                files.update({path: entry for path, entry in recorded_files.items() if entry["group"] == group.group})
+                continue
+
+            for file in render_group(group, values):
+                path = app_path(plan.root, file.filename)
+                action, content = _update_file(app_dir, path, file.content, recorded_files.get(path))
+                updates.append(FileUpdate(path, group.group, action))
+                files[path] = {"group": group.group, "hash": content_hash(file.content)}
+                base_files.append((path, file.content))
+                if content is not None:
+                    writes.append((path, content))
+
+    for path, entry in recorded_files.items():
+        if path not in files:
+            updates.append(FileUpdate(path, entry["group"], "orphaned"))
+
+    if dry_run:
+        return updates
+    if writes:
+        write_tree(writes, app_dir, fsync=fsync)
+    if base_files:
+        write_tree(base_files, os.path.join(app_dir, JOURNAL_DIR, BASE_DIR))
+    manifest.update(groups=groups, files=files)
+    save_app_manifest(app_dir, manifest)
+    return updates
@@ -1,5 +1,13 @@
+import os
+import hashlib
+import tempfile
 import subprocess
-from rich.console import Console
+from pathlib import Path
+from hyperpytext.utils.process_utils import probe_tool, run, run_command, run_install
+from hyperpytext.utils.bundle_utils import load_template_group
+from hyperpytext.utils.offline_utils import is_offline, wheelhouse_dir
+from hyperpytext.utils.templates_utils import create_file, get_template_path, project_name, render_pyproject
+from hyperpytext.utils.console_utils import console
 
 SERVER_DEPENDENCIES = [
     "uvicorn~=0.32.0",
@@ -7,23 +15,26 @@ SERVER_DEPENDENCIES = [
     "python-dotenv~=1.0.0",
     "piccolo[all]~=1.22.0",
     "piccolo-api~=1.5.2",
-    "yagmail~=0.15.293"
+    "aiosmtplib~=3.0.2",
+    "orjson~=3.10",
+    "brotli~=1.1"
 ]
 
-console = Console()
+DB_EXAMPLE_DEPENDENCIES = ["faker~=30.1.0"]
+
+# Pinned lockfiles live in react/server/locks, one per dependency set, see build_uv_lock_template
+UV_LOCKS_TEMPLATES = 'react/server/locks'
+LOCK_PLACEHOLDER_NAME = "hyperpy-lock-placeholder"
+
 
 def check_uv():
-    try:
-        result = subprocess.run(["uv", "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        console.print(f"uv is installed. Version: {result.stdout.strip()}")
-        return True
-    except subprocess.CalledProcessError as e:
-        console.print(f"Error running uv: {e}")
-        console.print(f"Stderr: {e.stderr}")
-        return False
-    except FileNotFoundError:
+    """Check if uv is installed and available in the system, the probe is cached (see process_utils.probe_tool)."""
+    uv = probe_tool("uv")
+    if uv is None:
         console.print("uv command not found in PATH.")
         return False
+    console.print(f"uv is installed. Version: {uv.version}")
+    return True
 
 
 def uv_install_instructions():
@@ -36,19 +47,73 @@ def uv_install_instructions():
     console.print("4. Verify the installation by running 'uv --version'")
 
 
-def setup_uv_environment(dependencies: list[str] | None = None):
+def dependencies_key(dependencies: list[str]) -> str:
+    """Short hash identifying a dependency set, the order of the dependencies does not matter."""
+    return hashlib.sha256("\n".join(sorted(dependencies)).encode()).hexdigest()[:16]
+
+
+def get_uv_lock_template(dependencies: list[str]) -> Path | None:
+    """Path to the pinned lockfile template for this dependency set, None if there isn't one."""
+    path = get_template_path(UV_LOCKS_TEMPLATES) / f"uv_{dependencies_key(dependencies)}.yaml"
+    return path if path.is_file() else None
+
+
+def create_uv_lock(project_dir: str, dependencies: list[str], app_name: str) -> bool:
+    """Writes the pinned uv.lock for this dependency set into project_dir, returns False if there isn't one."""
+    lock_template = get_uv_lock_template(dependencies)
+    if not lock_template:
+        return False
+
+    template = load_template_group(f"react/server/locks/{lock_template.stem}")
+    if sorted(template['dependencies']) != sorted(dependencies):
+        return False
+
+    content = template['content'].replace('{app_name}', project_name(app_name))
+    create_file('uv.lock', content, project_dir)
+    console.print("✔ Created pinned uv.lock")
+    return True
+
+
+async def uv_sync(project_dir: str, frozen: bool = False):
+    """Sync the project environment, with frozen=True the lockfile is used as is and nothing is resolved."""
+    cmd = ["uv", "sync"]
+    if frozen:
+        cmd.append("--frozen")
+    await run_install(cmd, cwd=project_dir)
+
+
+async def install_uv_dependencies(project_dir: str, dependencies: list[str], app_name: str):
+    """
+    Install the dependencies listed on the project pyproject.toml in a single uv run:
+    `uv sync --frozen` when a pinned lockfile ships for this dependency set (no resolution at all),
+    a plain `uv sync` otherwise (a single resolution for every dependency).
+    Offline the pinned lockfile is skipped, it points at the registry: uv resolves from the wheelhouse.
+    Failures are re-raised, so the step isn't recorded as done and a resumed run retries it.
+    """
+    try:
+        frozen = not is_offline() and create_uv_lock(project_dir, dependencies, app_name)
+        console.print("Syncing environment..." if not frozen else "Syncing environment from the pinned lockfile...")
+        await uv_sync(project_dir, frozen=frozen)
+        console.print("✔ Environment set up successfully!")
+    except subprocess.CalledProcessError:
+        console.print("🚩 Failed to set up environment. Please make sure uv is installed and try again.")
+        raise
+    except FileNotFoundError:
+        console.print("🚩 uv not found. Please install uv and try again.")
+        raise
+
+
+async def setup_uv_environment(project_dir: str, dependencies: list[str] | None = None):
+    """Initialize a uv project and add all the dependencies with a single `uv add` (one resolution)."""
     console.print("Setting up environment...")
     try:
         console.print("Initializing project...")
-        subprocess.run(["uv", "init"], check=True)
+        await run_command(["uv", "init"], cwd=project_dir)
 
         if dependencies:
             console.print("Adding project dependencies...")
-            for package in dependencies:
-                uv_add_dependency(package)
-
-        console.print("Syncing environment...")
-        subprocess.run(["uv", "sync"], check=True)
+            await run_install(["uv", "add", *dependencies], cwd=project_dir)
+            console.print(f"✔ Successfully added {', '.join(dependencies)}")
 
         console.print("✔ Environment set up successfully!")
     except subprocess.CalledProcessError:
@@ -57,21 +122,80 @@ def setup_uv_environment(dependencies: list[str] | None = None):
         console.print("🚩 uv not found. Please install uv and try again.")
 
 
-def uv_add_dependency(package: str, dev: bool = False):
+async def uv_add_dependency(project_dir: str, package: str, dev: bool = False):
     try:
         cmd = ["uv", "add"]
         if dev:
             cmd.append("--dev")
         cmd.append(package)
-        subprocess.run(cmd, check=True)
+        await run_install(cmd, cwd=project_dir)
         console.print(f"✔ Successfully added {package}")
     except subprocess.CalledProcessError:
         console.print(f"🚩 Failed to add dependency: {package}")
 
 
-def uv_remove_dependency(package: str):
+async def uv_remove_dependency(project_dir: str, package: str):
     try:
-        subprocess.run(["uv", "remove", package], check=True)
+        await run_command(["uv", "remove", package], cwd=project_dir)
         console.print(f"✔ Successfully removed {package}")
     except subprocess.CalledProcessError:
         console.print(f"🚩 Failed to remove dependency: {package}")
+
+
+async def warm_wheelhouse(dependency_sets: list[list[str]]):
+    """
+    Download the wheels of every package of each dependency set into the wheelhouse (see offline_utils),
+    from the pinned lockfile when one ships for the set: the same versions an online run installs.
+    """
+    wheelhouse = wheelhouse_dir()
+    os.makedirs(wheelhouse, exist_ok=True)
+    for dependencies in dependency_sets:
+        with tempfile.TemporaryDirectory() as project_dir:
+            filename, content = render_pyproject(LOCK_PLACEHOLDER_NAME, dependencies)
+            create_file(os.path.basename(filename), content, project_dir)
+            if not create_uv_lock(project_dir, dependencies, LOCK_PLACEHOLDER_NAME):
+                await run_install(["uv", "lock"], cwd=project_dir)
+            await run_command(
+                ["uv", "export", "--frozen", "--no-hashes", "--no-emit-project", "--format", "requirements-txt", "-o", "requirements.txt"],
+                cwd=project_dir,
+                interactive=False,
+            )
+            await run_install(
+                ["uv", "tool", "run", "pip", "download", "--dest", str(wheelhouse), "--requirement", "requirements.txt"],
+                cwd=project_dir,
+            )
+    console.print(f"✔ Wheelhouse ready in {wheelhouse}")
+
+
+def build_uv_lock_template(dependencies: list[str]) -> Path:
+    """
+    Resolve a dependency set with `uv lock` and store the lockfile as a template, keyed by the dependency set.
+    Run this whenever SERVER_DEPENDENCIES or DB_EXAMPLE_DEPENDENCIES change: python -m hyperpytext.utils.uv_utils
+    """
+    with tempfile.TemporaryDirectory() as project_dir:
+        filename, content = render_pyproject(LOCK_PLACEHOLDER_NAME, dependencies)
+        create_file(os.path.basename(filename), content, project_dir)
+        run(["uv", "lock"], cwd=project_dir, timeout=None)
+        with open(os.path.join(project_dir, 'uv.lock'), 'r') as f:
+            lock = f.read()
+
+    lock = lock.replace(f'name = "{LOCK_PLACEHOLDER_NAME}"', 'name = "{app_name}"')
+    lines = [
+        "filename: ./server/uv.lock",
+        "dependencies:",
+        *[f'  - "{dependency}"' for dependency in sorted(dependencies)],
+        "content: |",
+        *[f"  {line}" if line else "" for line in lock.splitlines()],
+    ]
+    locks_path = get_template_path(UV_LOCKS_TEMPLATES)
+    path = locks_path / f"uv_{dependencies_key(dependencies)}.yaml"
+    os.makedirs(locks_path, exist_ok=True)
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    console.print(f"✔ Created {path}")
+    return path
+
+
+if __name__ == "__main__":
+    for dependency_set in [SERVER_DEPENDENCIES, SERVER_DEPENDENCIES + DB_EXAMPLE_DEPENDENCIES]:
+        build_uv_lock_template(dependency_set)
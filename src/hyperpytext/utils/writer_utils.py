@@ -0,0 +1,104 @@
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+FSYNC_POLICIES = ["none", "file", "tree"]
+WRITE_WORKERS = 8
+STAGING_PREFIX = ".hyperpy-staging-"
+
+def _fsync_path(path: str):
+    # Some filesystems (and every folder on windows) can't be fsynced, durability is best effort there
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write(path: str, content: str, fsync: bool):
+    with open(path, 'w') as f:
+        f.write(content)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _publish(staged: str, destination: str, moved: list[str]):
+    """
+    Move a staged entry in place: a single atomic rename when the destination doesn't exist yet,
+    otherwise the staged tree is merged in, replacing each file atomically.
+    """
+    if not os.path.lexists(destination):
+        os.rename(staged, destination)
+        moved.append(destination)
+    elif os.path.isdir(staged) and os.path.isdir(destination) and not os.path.islink(destination):
+        for name in os.listdir(staged):
+            _publish(os.path.join(staged, name), os.path.join(destination, name), moved)
+    else:
+        os.replace(staged, destination)
+        moved.append(destination)
+
+
+def write_tree(
+    files: list[tuple[str, str]],
+    base_dir: str,
+    directories: list[str] | None = None,
+    fsync: str = "none",
+    max_workers: int = WRITE_WORKERS,
+) -> list[str]:
+    """
+    Write a whole file plan under base_dir, all or nothing.
+
+    The files ((filename, content), relative to base_dir) are written from a thread pool into a staging
+    folder inside base_dir, so it's on the same filesystem, creating each distinct folder once. The staged
+    tree is then published with a rename per top level entry: a new folder (server/...) appears at once,
+    entries that already exist (a vite project the client templates go into) get each file replaced
+    atomically. If anything fails before publishing, base_dir is left untouched.
+
+    fsync: "none" leaves durability to the OS, "file" syncs each file as it's written, "tree" syncs the
+    whole staged tree in one pass right before publishing. Both sync the published folders afterwards.
+    Returns the published paths.
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+
+    base_dir = os.path.abspath(base_dir)
+    os.makedirs(base_dir, exist_ok=True)
+    staging = os.path.join(base_dir, f"{STAGING_PREFIX}{uuid.uuid4().hex}")
+
+    paths = [os.path.normpath(os.path.join(staging, filename)) for filename, _ in files]
+    for path in paths:
+        if os.path.commonpath([staging, path]) != staging:
+            raise ValueError(f"{path} is outside of {base_dir}")
+    folders = {os.path.dirname(path) for path in paths}
+    folders.update(os.path.normpath(os.path.join(staging, directory)) for directory in directories or [])
+
+    try:
+        os.makedirs(staging)
+        # Parents first, each folder is created exactly once
+        for folder in sorted(folders, key=lambda folder: folder.count(os.sep)):
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files)))) as executor:
+            list(executor.map(lambda item: _write(item[0], item[1][1], fsync == "file"), zip(paths, files)))
+
+            if fsync == "tree":
+                list(executor.map(_fsync_path, set(paths) | folders | {staging}))
+
+        moved = []
+        for name in os.listdir(staging):
+            _publish(os.path.join(staging, name), os.path.join(base_dir, name), moved)
+
+        if fsync != "none":
+            for parent in {os.path.dirname(path) for path in moved}:
+                _fsync_path(parent)
+        return moved
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)